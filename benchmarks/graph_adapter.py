@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from timeit import default_timer
+
+import matplotlib
+matplotlib.use('Agg')
+
+from circuitry.adapters.graph import GraphAdapter
+from circuitry.devices.adder import DeviceAdd
+from circuitry.devices.mux import DeviceMux
+
+# Time of building GraphAdapter graph of device netlists, run from repository root:
+#   PYTHONPATH=. python benchmarks/graph_adapter.py
+# Each graph is built repeat times, the best time is reported
+repeat = 5
+
+
+def get_graph_time(device):
+    """Netlist node count and the best of repeat times of building graph, netlist is built before timing"""
+    netlist = device.netlist
+    times = list()
+    for _ in xrange(0, repeat):
+        start_time = default_timer()
+        _ = GraphAdapter(device).graph
+        times.append(default_timer() - start_time)
+    return len(netlist.reachable_nodes()), min(times)
+
+
+def get_devices():
+    for address_count in (3, 4, 5):
+        data_count = 2 ** address_count
+        yield 'DeviceMux %s data' % data_count, DeviceMux(strobe_signals='v:1',
+                                                          address_signals='a:%s' % address_count,
+                                                          data_signals='d:%s' % data_count,
+                                                          output_signals='y:1',
+                                                          strobe_signals_subs=dict(v0=1),
+                                                          output_signals_subs=dict(y0=1))
+    for bits_count, architecture in ((3, None), (4, None), (5, None),
+                                     (16, 'kogge-stone'), (32, 'kogge-stone'), (64, 'kogge-stone')):
+        device_kwargs = dict(strobe_signals='v:1',
+                             first_signals='f:%s' % bits_count,
+                             second_signals='s:%s' % bits_count,
+                             output_signals='d:%s' % (bits_count + 2),
+                             strobe_signals_subs=dict(v0=1))
+        if architecture:
+            device_kwargs['architecture'] = architecture
+        yield 'DeviceAdd %s bits %s' % (bits_count, architecture or ''), DeviceAdd(**device_kwargs)
+
+
+if __name__ == '__main__':
+    for device_name, device in get_devices():
+        nodes_count, graph_time = get_graph_time(device)
+        print '%-32s %6s nodes %10.4f s' % (device_name, nodes_count, graph_time)
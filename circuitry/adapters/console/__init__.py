@@ -19,15 +19,18 @@ class ConsoleTruthTableAdapter(AbstractAdapter):
     def _get_string_line(self, bin_line):
         return ''.join(map(str, bin_line)[::-1]) + ' '
 
+    def _console_table_lines(self):
+        for truth_table_line in self._truth_table:
+            yield ''.join([self._get_string_line(bin_line) for bin_line in truth_table_line]) + '\n'
+
     @property
     def console_table(self):
-        truth_table = self._truth_table
-        output_list = list()
-        for truth_table_line in truth_table:
-            for bin_line in truth_table_line:
-                output_list.append(self._get_string_line(bin_line))
-            output_list.append('\n')
-        return ''.join(output_list)
+        return ''.join(self._console_table_lines())
+
+    def write_console_table(self, output):
+        """Write truth table rows to file-like object one by one"""
+        for console_table_line in self._console_table_lines():
+            output.write(console_table_line)
 
 
 class TwosComplementConsoleTruthTableAdapter(ConsoleTruthTableAdapter):
@@ -11,16 +11,22 @@ from networkx import DiGraph, random_layout, draw_networkx_nodes, draw_networkx_
 from matplotlib import pyplot
 
 from circuitry.adapters import AbstractAdapter
-from circuitry.devices.simple import create_simple_device_by_function, create_simple_device_by_func_and_number_of_inputs
+from circuitry.logic.mapping import map_fan_in
+from circuitry.logic.simulation import simulate
+from circuitry.logic.timing import analyze_timing
 
 
 class GraphAdapter(AbstractAdapter):
-    public_properties = ('graph', 'max_distance')
+    public_methods = ('simulate',)
+    public_properties = ('graph', 'max_distance', 'mapping_report', 'timing_report')
     default_content_type = 'image/png'
-    _dnum = 0
+    # Gates wider than maximal fan-in for their type (e.g. {'or': 4}) are split, may be overridden by max_fan_in option
+    default_max_fan_in = None
     _graph = None
+    _netlist = None
+    _mapping_report = None
+    _timing_report = None
     _max_distance = 0
-    _temp_counter = 0
     _global_device_number = 0
 
     def default_method(self):
@@ -29,7 +35,7 @@ class GraphAdapter(AbstractAdapter):
         for graph_node in graph.nodes_iter():
             graph_type = graph.node[graph_node]['type']
             if graph_type == 'input':
-                labels_dict[graph_node] = graph_node
+                labels_dict[graph_node] = graph.node[graph_node]['name']
             elif graph_type == 'output':
                 labels_dict[graph_node] = 'output'
         pyplot.figure(figsize=(6, 4), dpi=100)
@@ -52,159 +58,85 @@ class GraphAdapter(AbstractAdapter):
         if self._graph is None:
             # Create directed graph
             self._graph = DiGraph()
-            for function in self._device.functions:
-                self._walk_through_device_function(function)
-            #self._process_graph()
-            #for node in self._graph.nodes():
-            #    print node, self._graph.node[node]
+            self._walk_through_netlist(self.netlist)
         return self._graph
 
+    @property
+    def netlist(self):
+        """Netlist of device mapped to gates of maximal fan-in"""
+        if self._netlist is None:
+            max_fan_in = self._options.get('max_fan_in', self.default_max_fan_in)
+            if max_fan_in:
+                self._netlist, self._mapping_report = map_fan_in(self._device.netlist, max_fan_in)
+            else:
+                self._netlist = self._device.netlist
+        return self._netlist
+
+    @property
+    def mapping_report(self):
+        """Gate count and logic depth before and after mapping or None if gates are not mapped"""
+        _ = self.netlist
+        return self._mapping_report
+
+    @property
+    def timing_report(self):
+        """Static timing analysis of netlist, delay_model and required_time options are passed to analyze_timing"""
+        if self._timing_report is None:
+            self._timing_report = analyze_timing(self.netlist, self._options.get('delay_model'),
+                                                 self._options.get('required_time'),
+                                                 output_names=self._get_output_names())
+        return self._timing_report
+
+    def simulate(self, stimulus, initial_values=None, max_records=10000):
+        """Event-driven simulation of netlist with delay_model option, see circuitry.logic.simulation.simulate"""
+        return simulate(self.netlist, stimulus, self._options.get('delay_model'), initial_values,
+                        self._get_output_names(), max_records)
+
+    def _get_output_names(self):
+        # Device outputs are named after output signals if there is a signal for each function
+        if len(self._device.output_signals) == len(self.netlist.outputs):
+            return self._device.output_signals
+        return None
+
     @property
     def max_distance(self):
         _ = self.graph
         return self._max_distance
 
-    def _walk_through_device_function(self, device_function, is_start=True, distance=0):
-        self._max_distance = distance
-        function_identifier = str(device_function)
-        device_type, _device = create_simple_device_by_function(device_function, is_start)
-        if not function_identifier in self.graph.nodes():
-            if _device is not None:
-                self.graph.add_node(function_identifier, device=_device, type=device_type,
-                                    distance=distance, global_device_number=self._global_device_number)
-                self._global_device_number += 1
-                for subfunction in device_function.args:
-                    self._walk_through_device_function(subfunction, is_start=False, distance=distance+1)
-                    self.graph.add_edge(str(subfunction), function_identifier)
-            else:
-                self.graph.add_node(function_identifier, type='input', distance=distance,
-                                    global_device_number=self._global_device_number)
-                self._global_device_number += 1
-
-    def _split_device_by_number_of_inputs(self, device, predecessors, successors, distance, number_of_inputs):
-        function = device.functions[0]
-        graph = self.graph
-
-        _orig_predecessors = predecessors
-
-        #print len(predecessors), number_of_inputs
-
-        if len(predecessors) <= number_of_inputs:
-            for predecessor in predecessors:
-                graph.add_edge(predecessor, str(function))
-                #print '!!!', predecessor
-            for successor in successors:
-                graph.add_edge(str(function), successor)
-                #print '!!!', successor
-
-            return False
-
-        #print function.args
-        function_args = sorted(list(function.args),
-                               key=lambda rec: int(
-                                   ''.join([i for i in str(rec) if ord(i) in range(ord('0'), ord('9') + 1)])
-                               ))
-        #from pprint import pprint
-
-        #for predecessor in predecessors:
-        #    print predecessor,
-        #    pprint(graph.node[predecessor])
-
-        #pprint(function_args)
-        pred_and_arg = zip(predecessors, function_args)
-        #print pred_and_arg
-        #pprint(pred_and_arg)
-        _addition_boolean = 0
-        _new_predecessors = list()
-        pred_and_arg_list = [pred_and_arg[x:x + number_of_inputs] for x in
-                             xrange(0, len(pred_and_arg), number_of_inputs)]
-        #
-        #pprint(pred_and_arg_list)
-        #x = False
-        for xargs in pred_and_arg_list:
-            predecessors, args = zip(*xargs)
-            #print 'args', function.func, args, predecessors
-            if len(args) == 1:
-                #print 'args', function.func, args, predecessors
-                #_new_predecessors.append(predecessors[0])
-                #x = True
-                continue
-            _device_type, _device = create_simple_device_by_function(function.func(*args), save_signal_names=True)
-            _device_name = str(_device.functions[0])
-            #print _device_name, _device_type, _device.functions[0]
-            graph.add_node(_device_name, type=_device_type, device=_device, distance=distance)
-            #for predecessor in predecessors:
-            #    graph.add_edge(predecessor, _device_name)
-            #    #print 'edge', predecessor, _device_name
-            _new_predecessors.append(_device_name)
-            #print 'device_pred', _device_name, _device_type
-        #print len(_new_predecessors)
-        #pprint(_new_predecessors)
-        _device_type, _device = create_simple_device_by_func_and_number_of_inputs(function.func, len(_new_predecessors),
-                                                                                  self._dnum)
-        self._dnum += 1
-        _device_name = str(_device.functions[0])
-        #if x:
-        #    #pprint(_device)
-        #    #print _device_name, _device_type
-        graph.add_node(_device_name, type=_device_type, device=_device, distance=distance)
-        _predpredecessors_count = 0
-        for predecessor in _new_predecessors:
-            #print '@', predecessor
-            graph.add_edge(predecessor, _device_name)
-            for in_signal in graph.node[predecessor]['device']['data_signals']:
-                if predecessor in _orig_predecessors:
+    def _walk_through_netlist(self, netlist):
+        """Add nodes of netlist depth-first from each output, graph nodes are numbers of netlist nodes.
+
+        Distance of node is the length of the first path from output found to it, and/or/not gates are walked
+        through, other nodes are inputs of graph.
+        """
+        graph = self._graph
+        visited = set()
+        for output in netlist.outputs:
+            stack = [(output, True, 0)]
+            while stack:
+                node, is_start, distance = stack.pop()
+                if node in visited:
                     continue
-                graph.add_edge(_orig_predecessors[_predpredecessors_count], predecessor)
-                _predpredecessors_count += 1
-                #pprint(in_signal)
-            #print 'edge', predecessor, _device_name
-        #print 'device_succ', _device_name, _device_type
-        for successor in successors:
-            graph.add_edge(_device_name, successor)
-            #print 'edge', _device_name, successor
-            #new_devices.append(self._split_device_by_number_of_inputs(_device, number_of_inputs))
-
-        if len(_new_predecessors) > number_of_inputs:
-            self._replace_graph_node(_device_name)
-
-        return True
-
-    def _replace_graph_node(self, current_node):
-        #print current_node
-        graph = self.graph
-        predecessors = graph.predecessors(current_node)
-        successors = graph.successors(current_node)
-        if 'device' in graph.node[current_node]:
-            _device = graph.node[current_node]['device']
-            if str(_device.functions[0].func).lower() in ['or']:
-                for predecessor in predecessors:
-                    graph.remove_edge(predecessor, current_node)
-                for successor in successors:
-                    graph.remove_edge(current_node, successor)
-                    #print _device.functions[0], _device.input_signals, len(predecessors)
-                _distance = graph.node[current_node]['distance']
-                if self._split_device_by_number_of_inputs(_device, predecessors, successors, _distance, 4):
-                    graph.remove_node(current_node)
-            #disconnected_nodes = list()
-        #for predecessor in :
-        #    pass
-        #print graph.node[current_node]
-        #print '#1', predecessors
-        predecessors = filter(lambda rec: graph.node[rec]['type'] == 'common', predecessors)
-        #print '#2', predecessors
-        return predecessors
-
-    def _process_graph(self, current_node=None):
-        graph = self.graph
-        if current_node is None:
-            for graph_node in graph.nodes_iter():
-                if graph.node[graph_node]['type'] == 'output':
-                    current_node = graph_node
-        #print graph.node[current_node], current_node
-        self._temp_counter += 1
-
-        predecessors = self._replace_graph_node(current_node)
-        for predecessor in predecessors:
-            self._process_graph(predecessor)
-        pass
+                visited.add(node)
+                self._max_distance = max(self._max_distance, distance)
+                operation = netlist.operations[node]
+                is_gate = operation in ('and', 'or', 'not')
+                if is_gate:
+                    device_type = 'output' if is_start else 'common'
+                    # Inverted inputs are inputs of graph unless they are outputs
+                    if operation == 'not' and not is_start and \
+                            netlist.operations[netlist.operands[node][0]] == 'input':
+                        device_type = 'input'
+                else:
+                    device_type = 'input'
+                if operation in ('input', 'constant'):
+                    name = str(netlist.values[node])
+                else:
+                    name = 'node%d' % node
+                graph.add_node(node, type=device_type, operation=operation, name=name, distance=distance,
+                               global_device_number=self._global_device_number)
+                self._global_device_number += 1
+                if is_gate:
+                    for operand in netlist.operands[node]:
+                        graph.add_edge(operand, node)
+                    stack.extend([(operand, False, distance + 1) for operand in reversed(netlist.operands[node])])
@@ -42,15 +42,24 @@ class LatexTruthTableAdapter(AbstractAdapter):
     def _latex_final_state_machine(self, current_signals_name, current_value):
         return '%s' % str(current_value)
 
-    @property
-    def latex_table(self):
-        truth_table = self._truth_table
-        truth_table_lines = list()
-        for row in truth_table:
+    def _latex_table_lines(self):
+        is_empty = True
+        for row in self._truth_table:
             row_list = list()
             for signals_column_number in range(0, len(self._device.truth_table_signals)):
                 current_signals_name = self._device.truth_table_signals[signals_column_number]
                 for current_value in row[signals_column_number]:
                     row_list.append(self._latex_final_state_machine(current_signals_name, current_value))
-            truth_table_lines.append('&'.join(row_list))
-        return ' \\\\\n'.join(truth_table_lines) + ' \\\\\n'
\ No newline at end of file
+            is_empty = False
+            yield '&'.join(row_list) + ' \\\\\n'
+        if is_empty:
+            yield ' \\\\\n'
+
+    @property
+    def latex_table(self):
+        return ''.join(self._latex_table_lines())
+
+    def write_latex_table(self, output):
+        """Write truth table rows to file-like object one by one"""
+        for latex_table_line in self._latex_table_lines():
+            output.write(latex_table_line)
\ No newline at end of file
@@ -5,6 +5,8 @@ __author__ = 'Sergey Sobko'
 __email__ = 'S.Sobko@profitware.ru'
 __copyright__ = 'Copyright 2013, The Profitware Group'
 
+from itertools import chain
+
 from circuitry.adapters.latex import LatexTruthTableAdapter
 
 
@@ -21,7 +23,7 @@ class DeviceMuxLatexTruthTableAdapter(LatexTruthTableAdapter):
                                             [['x'] * len(device.address_signals)] +
                                             [[0] * len(device.data_signals)] +
                                             [[1 - _y for _y in device.output_signals_truth_table]]))
-        return strobe_signals_add + truth_table
+        return chain(strobe_signals_add, truth_table)
 
     def _latex_final_state_machine(self, current_signals_name, current_value):
         current_value = str(current_value)
@@ -7,11 +7,21 @@ __copyright__ = 'Copyright 2013, The Profitware Group'
 
 from circuitry.adapters import AbstractAdapter
 from circuitry.adapters.graph import GraphAdapter
+from circuitry.devices.hierarchy import is_constant_net
 
 
 class MatlabAdapter(AbstractAdapter):
     public_methods = ('matlab_code',)
     default_method = lambda self: '\n'.join(self.matlab_code())
+    # Maximal numbers of inputs of logical operators, may be overridden by max_fan_in option
+    default_max_fan_in = {
+        'and': 4,
+        'or': 4
+    }
+    # Devices built of instances are exported as subsystems of instances, may be overridden by flatten option
+    default_flatten = False
+    _inport_names = None
+    _output_ports = None
 
     def _matlab_code_handle_counters(self, counters, device_type, device_func_name, device_height, position_x):
         counters['current_position_x'] = position_x
@@ -60,6 +70,8 @@ class MatlabAdapter(AbstractAdapter):
         return counters
 
     def _matlab_code_generate(self, matlab_code_lines, matlab_code_template):
+        if self._device.hierarchy is not None and not self._options.get('flatten', self.default_flatten):
+            return self._matlab_code_generate_hierarchy(matlab_code_lines, matlab_code_template)
         # Counters are used at each step to handle current and previous data
         _counters = {
             'inport': 0,
@@ -83,29 +95,30 @@ class MatlabAdapter(AbstractAdapter):
 
         _matlab_device_name_and_id = ''
 
-        graph_adapter = GraphAdapter(self._device)
+        graph_adapter = GraphAdapter(self._device, max_fan_in=self._options.get('max_fan_in', self.default_max_fan_in))
         graph = graph_adapter.graph
 
+        _input_names = map(str, reduce(list.__add__, map(list, self._device.input_signals)))
+
         def _sorting_function(rec):
-            second_param = 0
-            if graph.node[rec]['type'] == 'input' and not 'device' in graph.node[rec]:
-                second_param = map(str, reduce(list.__add__, map(list, self._device.input_signals))).index(rec)
-            if graph.node[rec]['type'] == 'output':
-                second_param = graph.node[rec]['global_device_number']
-            return _graph_type_order[graph.node[rec]['type']], second_param
+            # Inputs are ordered like input signals, gates in order they are found walking from outputs
+            if graph.node[rec]['operation'] == 'input':
+                return _graph_type_order[graph.node[rec]['type']], 0, _input_names.index(graph.node[rec]['name'])
+            return _graph_type_order[graph.node[rec]['type']], 1, graph.node[rec]['global_device_number']
 
         _output_device_list = list()
+        _output_nodes = list()
+        self._inport_names = list()
 
         for graph_node in sorted(graph.nodes(), key=_sorting_function):
             node = graph.node[graph_node]
-            _device, _device_type, _device_func_name, _device_height, _device_ports_count = \
-                None, node['type'], '', 10, 1
-
-            # not is_Atom
-            if 'device' in node:
-                _device = node['device']
-                _device_ports_count = len(_device.input_signals[0])
-                _device_func_name = str(_device.functions[0].func).lower()
+            _device_type, _device_func_name, _device_height, _device_ports_count = \
+                node['type'], '', 10, 1
+
+            # Gates
+            if node['operation'] in ('and', 'or', 'not'):
+                _device_ports_count = graph.in_degree(graph_node)
+                _device_func_name = node['operation']
                 _device_height = 10 * (_device_ports_count + 1)
 
             _counters = self._matlab_code_handle_counters(_counters, _device_type, _device_func_name, _device_height,
@@ -127,10 +140,11 @@ class MatlabAdapter(AbstractAdapter):
             if _device_type == 'input' and _device_func_name != 'not':
                 _counters['inport'] += 1
                 _device_options = {
-                    'device_id': graph_node # _counters['inport']
+                    'device_id': node['name']  # _counters['inport']
                 }
                 matlab_code_lines.append(matlab_code_template['add_block_input'] % _device_options)
-                _matlab_device_name_and_id = graph_node  # 'In%(device_id)s' % _device_options
+                _matlab_device_name_and_id = node['name']  # 'In%(device_id)s' % _device_options
+                self._inport_names.append(node['name'])
 
             # Not, And, Or
             if _device_func_name in _counters:
@@ -151,6 +165,7 @@ class MatlabAdapter(AbstractAdapter):
 
             if node['type'] == 'output':
                 _output_device_list.append(_matlab_device_name_and_id)
+                _output_nodes.append(graph_node)
 
         # Add output
         _counters = self._matlab_code_handle_counters(_counters, '', '', 0, graph_adapter.max_distance + 3)
@@ -177,6 +192,10 @@ class MatlabAdapter(AbstractAdapter):
                 'connect_to': 'Out%s/1' % _counters['outport']
             })
 
+        # Outport of each output of netlist, outputs without their own gates have no outports
+        self._output_ports = [_output_nodes.index(node) + 1 if node in _output_nodes else None
+                              for node in graph_adapter.netlist.outputs]
+
         # Connect devices using edges
         _connection_ports = dict()
         for edge in graph.edges_iter():
@@ -192,6 +211,73 @@ class MatlabAdapter(AbstractAdapter):
             })
         return matlab_code_lines
 
+    def _matlab_code_generate_hierarchy(self, matlab_code_lines, matlab_code_template):
+        """Inports of all input signals and subsystem of each instance connected by nets, subsystems contain models
+        of devices of instances
+        """
+        instances, output_nets = self._device.hierarchy
+        # Ports of nets and columns of blocks driving them
+        sources = dict()
+        columns = dict()
+        positions_y = dict()
+
+        def _add_position(column, height):
+            matlab_code_lines.append(matlab_code_template['position'] % {
+                'x': 200 * (column + 1),
+                'y': positions_y.get(column, 0),
+                'width': 30 if column else 20,
+                'height': height
+            })
+            positions_y[column] = positions_y.get(column, 0) + height + 20
+
+        def _get_source(net):
+            if net not in sources and is_constant_net(net):
+                _add_position(0, 20)
+                matlab_code_lines.append(matlab_code_template['add_block_const'] % {
+                    'device_id': 'Const%d' % bool(net),
+                    'value': int(bool(net))
+                })
+                sources[net], columns[net] = 'Const%d/1' % bool(net), 0
+            return sources[net]
+
+        self._inport_names = self._device._get_input_names()
+        for input_name in self._inport_names:
+            _add_position(0, 10)
+            matlab_code_lines.append(matlab_code_template['add_block_input'] % {'device_id': input_name})
+            sources[input_name], columns[input_name] = '%s/1' % input_name, 0
+
+        for instance in instances:
+            instance_adapter = self.__class__(instance.device, **self._options)
+            column = max([columns.get(net, 0) for net in instance.input_nets] or [0]) + 1
+            matlab_code_lines.append(r"sys = [sys '/%s']" % instance.name)
+            _add_position(column, 15 * (max(len(instance.input_nets), len(instance.output_nets)) + 1))
+            matlab_code_lines.append(matlab_code_template['add_block_subsystem'])
+            instance_adapter._matlab_code_generate(matlab_code_lines, matlab_code_template)
+            matlab_code_lines.append(r"sys = get_param(sys, 'Parent')")
+            # Unused input signals of device have no inports
+            inport_names = instance_adapter._inport_names
+            for input_name, net in zip(instance.device._get_input_names(), instance.input_nets):
+                if input_name in inport_names:
+                    matlab_code_lines.append(matlab_code_template['add_line'] % {
+                        'connect_from': _get_source(net),
+                        'connect_to': '%s/%d' % (instance.name, inport_names.index(input_name) + 1)
+                    })
+            for net, port in zip(instance.output_nets, instance_adapter._output_ports):
+                if port is not None:
+                    sources[net], columns[net] = '%s/%d' % (instance.name, port), column
+
+        output_column = max(columns.values() or [0]) + 1
+        self._output_ports = list()
+        for i, net in enumerate(output_nets[:self._device._get_outputs_count()]):
+            _add_position(output_column, 20)
+            matlab_code_lines.append(matlab_code_template['add_block_output'] % {'device_id': i + 1})
+            matlab_code_lines.append(matlab_code_template['add_line'] % {
+                'connect_from': _get_source(net),
+                'connect_to': 'Out%d/1' % (i + 1)
+            })
+            self._output_ports.append(i + 1)
+        return matlab_code_lines
+
     def matlab_code(self, **kwargs):
         model_dict = kwargs
         _matlab_code_template = {
@@ -203,6 +289,8 @@ class MatlabAdapter(AbstractAdapter):
             'add_block_input': r"add_block('built-in/Inport', [sys '/%(device_id)s'], 'Position', pos)",
             'add_line': r"add_line(sys, '%(connect_from)s', '%(connect_to)s', 'autorouting','on')",
             'add_block_output': r"add_block('built-in/Outport', [sys '/Out%(device_id)s'], 'Position', pos)",
+            'add_block_const': r"add_block('built-in/Constant', [sys '/%(device_id)s'], " +
+                               r"'Position', pos, 'Value', '%(value)s', 'OutDataTypeStr', 'boolean')",
             'add_block_subsystem': r"add_block('built-in/SubSystem', sys, 'Position', pos)"
         }
         if model_dict is None or len(model_dict) == 0:
@@ -6,9 +6,12 @@ __email__ = 'S.Sobko@profitware.ru'
 __copyright__ = 'Copyright 2013, The Profitware Group'
 
 from PIL import Image, ImageDraw
+from sympy import Symbol
+from sympy.logic import Not
 
 
-from circuitry.devices.simple import create_simple_device_by_function
+from circuitry.devices.simple import create_simple_device_by_netlist_node
+from circuitry.logic.mapping import map_fan_in
 from circuitry.adapters.visual import load_font
 from circuitry.adapters.visual.symbol import ElectronicSymbolAdapter
 from circuitry.adapters.visual.wires import Wire, WiresPool
@@ -19,6 +22,7 @@ class DefaultSchematics(object):
     _font = None
     _surface = None
     _device = None
+    _netlist = None
 
     _options = None
     _inputs = None
@@ -39,30 +43,37 @@ class DefaultSchematics(object):
             'width': 800,
             'height': 600,
             'indent_x': 40,
-            'indent_y': 10
+            'indent_y': 10,
+            'max_fan_in': {
+                'and': 4,
+                'or': 4
+            }
         }
         self._inputs = set()
         self._inputs_not = set()
         # Here we may set width, height, device and other options
         self._options.update(kwargs)
-        # Load device
+        # Load device and map it to gates of maximal fan-in
         self._device = self._options['device']
+        self._netlist = self._device.netlist
+        if self._options['max_fan_in']:
+            self._netlist, _ = map_fan_in(self._netlist, self._options['max_fan_in'])
         # PIL manipulations
         self._image = Image.new('RGB', (self._options['width'], self._options['height']),
                                 self._options['background'])
         self._font = load_font(self._options['fontname'])
         self._surface = ImageDraw.Draw(self._image)
 
-    def _draw_simple_device(self, device_function_list, position_index, device_offset):
-        _device_distance_height = self._options['height'] / (len(device_function_list) + 1) + device_offset
+    def _draw_simple_device(self, netlist_nodes_list, position_index, device_offset):
+        netlist = self._netlist
+        _device_distance_height = self._options['height'] / (len(netlist_nodes_list) + 1) + device_offset
         _device_height = _device_distance_height
-        for device_function in device_function_list:
-            device_type, _device = create_simple_device_by_function(device_function)
+        for netlist_node in netlist_nodes_list:
+            device_type, _device = create_simple_device_by_netlist_node(netlist, netlist_node)
             if _device is not None:
-                _created_device_function = _device.functions[0]
                 if device_type == 'input':
-                    if str(_created_device_function.func).lower() == 'not':
-                        self._inputs_not |= {device_function}
+                    if netlist.operations[netlist_node] == 'not':
+                        self._inputs_not |= {Not(Symbol(netlist.values[netlist.operands[netlist_node][0]]))}
                 _device_symbol = ElectronicSymbolAdapter(_device)
                 self._image.paste(_device_symbol.image,
                                   (self._options['width'] - _device_symbol._options['width'] * position_index,
@@ -78,18 +89,21 @@ class DefaultSchematics(object):
 
 
 class MultiplexerSchematics(DefaultSchematics):
-    def _draw_device(self, function_list=None, position=1, _device_offset=None):
-        if function_list is None:
-            _args_list = [self._device.functions[0]]
+    def _draw_device(self, netlist_nodes_list=None, position=1, _device_offset=None):
+        netlist = self._netlist
+        if netlist_nodes_list is None:
+            _args_list = netlist.outputs[:1]
         else:
-            _args_list = function_list
+            _args_list = netlist_nodes_list
         _device_offset = len(_args_list) * self._options['pins_interval_height']
-        self._inputs |= set(filter(lambda x: x.is_Atom, _args_list))
+        self._inputs |= set([Symbol(netlist.values[_arg]) for _arg in _args_list
+                             if netlist.operations[_arg] == 'input'])
         self._draw_simple_device(_args_list, position, _device_offset)
-        _next_function_list = reduce(list.__add__, [list(_arg.args) for _arg in _args_list])
-        if reduce(lambda x, y: x and y.is_Atom, _next_function_list):
+        _next_nodes_list = reduce(list.__add__, [list(netlist.operands[_arg]) for _arg in _args_list])
+        # Levels are drawn until all nodes except the first one are inputs
+        if all([netlist.operations[_node] == 'input' for _node in _next_nodes_list[1:]]):
             return
-        self._draw_device(_next_function_list, position + 2, _device_offset)
+        self._draw_device(_next_nodes_list, position + 2, _device_offset)
 
     def _draw_inputs(self):
         # FIXME: Draw wires and connect devices to input bus
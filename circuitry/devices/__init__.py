@@ -5,10 +5,27 @@ __author__ = 'Sergey Sobko'
 __email__ = 'S.Sobko@profitware.ru'
 __copyright__ = 'Copyright 2013, The Profitware Group'
 
+from copy import copy, deepcopy
+
+import numpy
 from sympy import symbols
-from sympy.logic.boolalg import SOPform
 
-from circuitry.exceptions import SignalsNotSpecified, SignalsSubsNotSpecified, SignalsSubsMismatch
+from circuitry.devices.cache import FrozenDict, device_cache
+from circuitry.devices.hierarchy import is_constant_net, flatten_instances
+from circuitry.exceptions import SignalsNotSpecified, SignalsSubsNotSpecified, SignalsSubsMismatch, \
+    EvaluationBackendNotSupported, DeviceFrozen, LogicFunctionNotSpecified, ReferenceModelNotSpecified
+from circuitry.logic.bdd import BDD
+from circuitry.logic.compiler import compile_netlist
+from circuitry.logic.equivalence import check_equivalence
+from circuitry.logic.faults import generate_faults, get_fault_name, simulate_faults
+from circuitry.logic.minimize import minimize_sop
+from circuitry.logic.netlist import Netlist
+from circuitry.logic.numeric import NumpyKernel, generate_input_matrix, get_words, get_bit_columns, pack_columns, \
+    unpack_columns
+from circuitry.logic.optimization import optimization_passes, optimize_netlist, substitute_inputs
+from circuitry.logic.parallel import generate_packed_lines
+from circuitry.logic.sweep import GrayCodeSweep
+from circuitry.logic.truth_table import TruthTable, StreamingTruthTable
 
 
 def generate_binary_lines_current(n_bin, i):
@@ -24,6 +41,30 @@ class Device(dict):
     mandatory_signals = None
     mandatory_signals_using_subs = None
     constraints = None
+    # Backend for truth tables, may be overridden by evaluation_backend keyword argument
+    default_evaluation_backend = 'compiled'
+    evaluation_backends = {
+        'sympy': '_truth_table_evaluator_by_sympy',
+        'numpy': '_truth_table_evaluator_by_numpy',
+        'compiled': '_truth_table_evaluator_by_compiled',
+        'gray': '_truth_table_evaluator_by_gray_code'
+    }
+    # Rows of streaming truth tables are evaluated on demand, may be overridden by streaming keyword argument
+    default_streaming = False
+    # Number of processes evaluating shards of truth tables, may be overridden by workers keyword argument
+    default_workers = 1
+    # Passes optimizing netlist of functions (see circuitry.logic.optimization), may be overridden by
+    # optimization_passes keyword argument, () keeps netlist as it is built from functions
+    default_optimization_passes = optimization_passes
+    # Devices wider than default_architecture_max_width (see _get_width) are built by default_wide_architecture
+    # unless architecture keyword argument is given, for default architectures impractical for wide devices
+    default_architecture_max_width = None
+    default_wide_architecture = None
+    # Items computed on first access and kept until items they are computed from are changed
+    lazy_items = ('functions', 'truth_table', 'hierarchy')
+    # Options changing functions (besides signals) and options changing only the way truth table is evaluated
+    functions_options = ()
+    truth_table_options = ('evaluation_backend', 'streaming', 'workers')
 
     def __init__(self, **kwargs):
         signals = dict()
@@ -51,16 +92,22 @@ class Device(dict):
         # Create truth tables and functions by substitutions
         for _subs_name in signals:
             if '%s_subs' % _subs_name in specified_set:
-                try:
-                    kwargs.update({'%s_truth_table' % _subs_name:
-                                   [signals_subs['%s_subs' % _subs_name][str(_name)] for _name in signals[_subs_name]]})
-                    kwargs.update({'%s_function' % _subs_name:
-                                   SOPform(signals[_subs_name], [kwargs['%s_truth_table' % _subs_name]])})
-                except KeyError:
-                    raise SignalsSubsMismatch(tuple(signals[_subs_name]))
+                kwargs.update(self._generate_signals_subs_items(_subs_name, signals[_subs_name],
+                                                                signals_subs['%s_subs' % _subs_name]))
         kwargs.update(signals)
         super(Device, self).__init__(**kwargs)
 
+    @staticmethod
+    def _generate_signals_subs_items(signals_name, signals, signals_subs):
+        try:
+            signals_truth_table = [signals_subs[str(_name)] for _name in signals]
+        except KeyError:
+            raise SignalsSubsMismatch(tuple(signals))
+        return {
+            '%s_truth_table' % signals_name: signals_truth_table,
+            '%s_function' % signals_name: minimize_sop(signals, [signals_truth_table])
+        }
+
     # TODO: MyHDL integration
 
     @property
@@ -71,6 +118,112 @@ class Device(dict):
                 signals_list += [self[i]]
         return signals_list
 
+    def _get_signals_kwargs(self):
+        """Keyword arguments for creating devices with the same signals, substitutions and options"""
+        kwargs = dict()
+        for key, value in self.iteritems():
+            if key.endswith('_signals'):
+                kwargs[key] = '%s,' % ','.join(map(str, value))
+            elif key.endswith('_signals_subs'):
+                kwargs[key] = dict(value)
+            elif key in self.functions_options:
+                kwargs[key] = deepcopy(value)
+        return kwargs
+
+    @classmethod
+    def cached(cls, **kwargs):
+        """Shared frozen device from process-wide cache, see circuitry.devices.cache"""
+        return device_cache.get_device(cls, **kwargs)
+
+    def freeze(self):
+        """Forbid further changes of device, substitutions of signals and their truth tables become immutable too"""
+        if 'functions' in self:
+            super(Device, self).__setitem__('functions', tuple(self['functions']))
+        for key, value in self.items():
+            if key.endswith('_signals_subs'):
+                super(Device, self).__setitem__(key, FrozenDict(value))
+            elif key.endswith('_signals_truth_table'):
+                super(Device, self).__setitem__(key, tuple(value))
+        self.__dict__['_frozen'] = True
+
+    @property
+    def is_frozen(self):
+        return self.__dict__.get('_frozen', False)
+
+    def _check_not_frozen(self, key):
+        if self.is_frozen:
+            raise DeviceFrozen(key)
+
+    def __missing__(self, key):
+        if key not in self.lazy_items:
+            raise KeyError(key)
+        value = getattr(self, '_generate_%s' % key)()
+        if key == 'functions' and self.is_frozen:
+            value = tuple(value)
+        # Cached value is not a change of device, so it is stored even if device is frozen
+        super(Device, self).__setitem__(key, value)
+        return value
+
+    def _invalidate(self, key):
+        """Forget lazy items computed from changed item"""
+        if key == 'functions':
+            dependent_items = ('truth_table', 'hierarchy')
+        elif key.endswith('_signals') or key.endswith('_signals_subs') or key in self.functions_options:
+            dependent_items = self.lazy_items
+        elif key in self.truth_table_options:
+            dependent_items = ('truth_table',)
+        else:
+            return
+        for item in dependent_items:
+            super(Device, self).pop(item, None)
+        if key == 'functions' or 'functions' in dependent_items:
+            self.__dict__.pop('_netlist_functions', None)
+
+    def __setitem__(self, key, value):
+        self._check_not_frozen(key)
+        if key.endswith('_signals') and isinstance(value, basestring):
+            value = symbols(value)
+        super(Device, self).__setitem__(key, value)
+        signals_name = key[:-len('_subs')]
+        if key.endswith('_signals_subs') and signals_name in self:
+            super(Device, self).update(self._generate_signals_subs_items(signals_name, self[signals_name], value))
+        self._invalidate(key)
+        if key == 'functions':
+            # Assigned functions are evaluated instead of instances device is built of
+            super(Device, self).__setitem__('hierarchy', None)
+
+    def __delitem__(self, key):
+        self._check_not_frozen(key)
+        super(Device, self).__delitem__(key)
+        self._invalidate(key)
+
+    def update(self, *args, **kwargs):
+        self._check_not_frozen(None)
+        for key, value in dict(*args, **kwargs).iteritems():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        self._check_not_frozen(key)
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *args):
+        self._check_not_frozen(key)
+        value = super(Device, self).pop(key, *args)
+        self._invalidate(key)
+        return value
+
+    def popitem(self):
+        self._check_not_frozen(None)
+        key, value = super(Device, self).popitem()
+        self._invalidate(key)
+        return key, value
+
+    def clear(self):
+        self._check_not_frozen(None)
+        super(Device, self).clear()
+
     def __setattr__(self, key, value):
         self[key] = value
 
@@ -80,36 +233,535 @@ class Device(dict):
         except KeyError:
             return self.__getattribute__(item)
 
-    def _generate_through_truth_table(self, signals_list=None):
-        self.truth_table = list()
+    def _get_functions_netlist(self):
+        """Netlist of functions with equal subexpressions shared, built once for current functions.
+
+        Netlist built directly for device (see _generate_netlist) is used without generating functions.
+        """
+        if 'functions' not in self:
+            netlist = self._get_generated_netlist()
+            if netlist is not None:
+                return netlist
+        functions = tuple(self.functions)
+        netlist_functions = self.__dict__.get('_netlist_functions')
+        if netlist_functions is not None and netlist_functions[0] is None:
+            # Functions were generated of the netlist built directly
+            netlist_functions = (functions, netlist_functions[1])
+            self.__dict__['_netlist_functions'] = netlist_functions
+        if netlist_functions is None or netlist_functions[0] != functions:
+            netlist_functions = (functions, Netlist.from_functions(functions, self._get_input_names()))
+            self.__dict__['_netlist_functions'] = netlist_functions
+        return netlist_functions[1]
+
+    def _get_optimized_netlist(self):
+        """Functions netlist, optimized netlist and optimization report, optimized once for current functions"""
+        functions_netlist = self._get_functions_netlist()
+        passes = tuple(self.get('optimization_passes', self.default_optimization_passes))
+        optimized_netlist = self.__dict__.get('_optimized_netlist')
+        if optimized_netlist is None or optimized_netlist[0] is not functions_netlist or \
+                optimized_netlist[1] != passes:
+            optimized_netlist = (functions_netlist, passes) + optimize_netlist(functions_netlist, passes)
+            self.__dict__['_optimized_netlist'] = optimized_netlist
+        return optimized_netlist
+
+    @property
+    def netlist(self):
+        """Optimized netlist of functions, see optimization_passes"""
+        return self._get_optimized_netlist()[2]
+
+    @property
+    def optimization_report(self):
+        """Gates removed by each optimization pass, gate count and logic depth before and after optimization"""
+        return self._get_optimized_netlist()[3]
+
+    def _get_input_names(self):
+        return [str(signal) for signals in self.input_signals for signal in signals]
+
+    def _generate_netlist(self):
+        """Netlist built directly for device (e.g. by architecture), None for devices built from functions.
+
+        Devices built of instances are flattened.
+        """
+        if self.hierarchy is None:
+            return None
+        return self.flatten()
+
+    def _get_generated_netlist(self):
+        """Netlist built directly for device, built once and kept until functions are generated"""
+        netlist_functions = self.__dict__.get('_netlist_functions')
+        if netlist_functions is None:
+            netlist = self._generate_netlist()
+            if netlist is None:
+                return None
+            netlist_functions = (None, netlist)
+            self.__dict__['_netlist_functions'] = netlist_functions
+        return netlist_functions[1]
+
+    def _get_functions_of_netlist(self):
+        """Functions of outputs of netlist built directly for device, generated only when functions are needed"""
+        return self._get_generated_netlist().to_functions()
+
+    def _get_compiled_functions(self):
+        """Netlist and compiled Python function for current functions, recompiled only when functions change"""
+        netlist = self.netlist
+        compiled_functions = self.__dict__.get('_compiled_functions')
+        if compiled_functions is None or compiled_functions[0] is not netlist:
+            compiled_functions = (netlist, compile_netlist(netlist))
+            self.__dict__['_compiled_functions'] = compiled_functions
+        return compiled_functions
+
+    @property
+    def bdd(self):
+        """Binary decision diagrams of functions, see _get_variables_order"""
+        netlist = self.netlist
+        bdd_netlist = self.__dict__.get('_bdd_netlist')
+        if bdd_netlist is None or bdd_netlist[0] is not netlist:
+            bdd_netlist = (netlist, BDD.from_netlist(netlist, self._get_variables_order()))
+            self.__dict__['_bdd_netlist'] = bdd_netlist
+        return bdd_netlist[1]
+
+    def _get_variables_order(self):
+        """Strobe signals followed by bits of data signals interleaved from the lowest ones (f0, s0, f1, s1, ...).
+
+        Operands of comparators and adders are related bit by bit, so diagrams stay small for interleaved bits while
+        they grow exponentially with width if all bits of one operand precede the other.
+        """
+        signals_list = [self[signals_name] for signals_name in self._get_data_signals_names()]
+        variables = [str(signal) for signal in self.get('strobe_signals', ())]
+        for i in xrange(0, max([len(signals) for signals in signals_list] or [0])):
+            variables.extend([str(signals[i]) for signals in signals_list if i < len(signals)])
+        return variables
+
+    def _get_constant_subs(self):
+        """Values of input signals which are constant for evaluation (substitutions of strobe signals)"""
+        if 'strobe_signals' in self.mandatory_signals:
+            return dict(self.strobe_signals_subs)
+        return dict()
+
+    @property
+    def supports(self):
+        """Names of input signals each evaluated output depends on, in order of input signals.
+
+        Strobe signals are substituted by constants, so outputs do not depend on them. Supports of outputs of devices
+        built of instances are joined from supports of instances, devices are not flattened for them.
+        """
+        key = self.netlist if self.hierarchy is None else self.hierarchy
+        supports = self.__dict__.get('_supports')
+        if supports is None or supports[0] is not key:
+            if self.hierarchy is None:
+                netlist = substitute_inputs(self.netlist, self._get_constant_subs())
+                supports = (key, [netlist.get_support([node]) for node in netlist.outputs[:self._get_outputs_count()]])
+            else:
+                supports = (key, self._get_hierarchy_supports())
+            self.__dict__['_supports'] = supports
+        return supports[1]
+
+    def _get_hierarchy_supports(self):
+        input_names = self._get_input_names()
+        constant_subs = self._get_constant_subs()
+        net_supports = dict([(name, set() if name in constant_subs else set([name])) for name in input_names])
+
+        def _get_net_support(net):
+            if is_constant_net(net):
+                return set()
+            elif net not in net_supports:
+                raise SignalsNotSpecified((net,))
+            return net_supports[net]
+
+        instances, output_nets = self.hierarchy
+        for instance in instances:
+            input_supports = dict([(name, _get_net_support(net))
+                                   for name, net in zip(instance.device._get_input_names(), instance.input_nets)])
+            for output_net, support in zip(instance.output_nets, instance.device.supports):
+                net_supports[output_net] = set().union(*[input_supports[name] for name in support])
+        return [[name for name in input_names if name in _get_net_support(net)]
+                for net in output_nets[:self._get_outputs_count()]]
+
+    def _get_outputs_count(self):
+        """Number of evaluated outputs, functions of devices built of instances are not flattened for it"""
+        if self.hierarchy is None:
+            return min(len(self.output_signals), len(self._get_functions_netlist().outputs))
+        return min(len(self.output_signals), len(self.hierarchy[1]))
+
+    def _evaluate_compiled(self, mask, values):
+        """Outputs of compiled function for values of signals by names (see circuitry.logic.compiler).
+
+        Devices built of instances are evaluated instance by instance by compiled functions of their devices.
+        """
+        if self.hierarchy is None:
+            netlist, compiled_function = self._get_compiled_functions()
+            return compiled_function(mask, self._get_compiled_inputs(netlist, values))
+        instances, output_nets = self.hierarchy
+        values = dict(values)
+        for instance in instances:
+            instance_values = dict()
+            for name, net in zip(instance.device._get_input_names(), instance.input_nets):
+                if is_constant_net(net):
+                    instance_values[name] = mask if net else mask ^ mask
+                elif net in values:
+                    instance_values[name] = values[net]
+                else:
+                    raise SignalsNotSpecified((net,))
+            values.update(zip(instance.output_nets, instance.device._evaluate_compiled(mask, instance_values)))
+        unknown_signals = [net for net in output_nets if net not in values]
+        if unknown_signals:
+            raise SignalsNotSpecified(tuple(unknown_signals))
+        return tuple([values[net] for net in output_nets])
+
+    def _get_compiled_inputs(self, netlist, values):
+        unknown_signals = [netlist.values[node] for node in netlist.inputs if netlist.values[node] not in values]
+        if unknown_signals:
+            raise SignalsNotSpecified(tuple(unknown_signals))
+        return [values[netlist.values[node]] for node in netlist.inputs]
+
+    def evaluate(self, **kwargs):
+        """Output values for integer values of signals (first=5 or first_signals=5) or single signals (f0=1)"""
+        values = self._get_constant_subs()
+        for key, value in kwargs.iteritems():
+            signals_name = key if key.endswith('_signals') else '%s_signals' % key
+            if signals_name in self and signals_name != 'output_signals':
+                for i in range(0, len(self[signals_name])):
+                    values[str(self[signals_name][i])] = (int(value) >> i) & 1
+            else:
+                values[key] = int(value) & 1
+        outputs = self._evaluate_compiled(1, values)
+        return [1 if output else 0 for output in outputs[:min(len(self.output_signals), len(outputs))]]
+
+    def _get_batch_values(self, inputs, kwargs):
+        """Packed words of input signals by names for batch of input vectors and number of vectors"""
+        signals_names = self._get_data_signals_names()
+        bit_columns = list()
+        if inputs is not None:
+            inputs = numpy.asarray(inputs)
+            vectors_count = inputs.shape[0]
+            input_names = [str(signal) for signals_name in signals_names for signal in self[signals_name]]
+            bit_columns.extend(zip(input_names, numpy.ascontiguousarray(inputs.T) != 0))
+        else:
+            vectors_count = max([numpy.size(value) for value in kwargs.itervalues()] or [0])
+        for key, value in kwargs.iteritems():
+            signals_name = key if key.endswith('_signals') else '%s_signals' % key
+            # Single values are used for all vectors
+            words = numpy.zeros(vectors_count, dtype=numpy.uint64) + numpy.asarray(value).astype(numpy.uint64)
+            if signals_name in self and signals_name != 'output_signals':
+                bit_columns.extend(zip([str(signal) for signal in self[signals_name]],
+                                       get_bit_columns(words, len(self[signals_name]))))
+            else:
+                bit_columns.append((key, get_bit_columns(words, 1)[0]))
+        values = self._get_constant_subs()
+        values.update([(name, numpy.uint64(2 ** 64 - 1) if value else numpy.uint64(0))
+                       for name, value in values.iteritems()])
+        if bit_columns:
+            values.update(zip([name for name, _ in bit_columns], pack_columns([column for _, column in bit_columns])))
+        return values, vectors_count
+
+    def evaluate_batch(self, inputs=None, **kwargs):
+        """Output columns for batch of input vectors, array of 0 and 1 with row for each output.
+
+        Inputs are 2-D array with row for each vector and column for each bit of data signals (in order of
+        check_reference) or arrays of integer values of signals (first=array or first_signals=array) or single
+        signals (f0=array). Vectors are packed 64 to a word, each gate is evaluated once for each word.
+        """
+        values, vectors_count = self._get_batch_values(inputs, kwargs)
+        outputs = self._evaluate_compiled(numpy.uint64(2 ** 64 - 1), values)[:self._get_outputs_count()]
+        words_count = (vectors_count + 63) // 64
+        # Constant outputs are broadcast to all words
+        return unpack_columns([numpy.zeros(words_count, dtype=numpy.uint64) | output for output in outputs],
+                              vectors_count)
+
+    def simulate_faults(self, inputs=None, vectors_count=None, seed=None, workers=1, **kwargs):
+        """Coverage of single stuck-at faults of netlist nets by batch of input vectors.
+
+        Vectors are given like for evaluate_batch, random (vectors_count of them) or all rows of truth table
+        by default, strobe signals keep their values, so faults stuck at these values are not simulated. Returns
+        numbers of vectors and faults, coverage, detected faults with numbers of the first vectors detecting them
+        and undetected faults by names of nets.
+        """
+        if inputs is None and not kwargs:
+            signals_list = [self[signals_name] for signals_name in self._get_data_signals_names()]
+            if vectors_count is None:
+                input_columns = generate_input_matrix(signals_list)
+            else:
+                random_state = numpy.random.RandomState(seed)
+                input_columns = random_state.randint(0, 2, size=(sum([len(signals) for signals in signals_list]),
+                                                                 vectors_count)).astype(numpy.bool_)
+            kwargs = dict(zip([str(signal) for signals in signals_list for signal in signals], input_columns))
+        values, vectors_count = self._get_batch_values(inputs, kwargs)
+        netlist = self.netlist
+        constant_subs = dict([(str(name), int(bool(value))) for name, value in self._get_constant_subs().iteritems()])
+        faults = [fault for fault in generate_faults(netlist)
+                  if not (netlist.operations[fault[0]] == 'input' and
+                          constant_subs.get(netlist.values[fault[0]]) == fault[1])]
+        detections = simulate_faults(netlist, self._get_compiled_inputs(netlist, values), vectors_count, faults,
+                                     workers)
+        return {
+            'vectors': vectors_count,
+            'faults': len(faults),
+            'coverage': float(len(detections)) / len(faults) if faults else 1.0,
+            'detected': dict([(get_fault_name(netlist, fault), vector) for fault, vector in detections.iteritems()]),
+            'undetected': [get_fault_name(netlist, fault) for fault in faults if fault not in detections]
+        }
+
+    def check_equivalence(self, other, engine='sat', signals_map=None):
+        """Check that outputs of device are equal to outputs of other device (or netlist) for all input values.
+
+        Signals are matched by names, signals of other device may be renamed by signals_map. Decided by SAT solver
+        ('sat') or binary decision diagrams ('bdd'), see circuitry.logic.equivalence.check_equivalence. All evaluated
+        outputs are compared, devices with different numbers of them are not equivalent.
+        """
+        if isinstance(other, Device):
+            other = other._get_evaluated_netlist()
+        signals_map = dict([(str(name), str(signal)) for name, signal in (signals_map or dict()).iteritems()])
+        return check_equivalence(self._get_evaluated_netlist(), other, engine, None, signals_map)
+
+    def _get_evaluated_netlist(self):
+        """Netlist with outputs evaluated for output signals only (see _get_outputs_count), nodes are shared"""
+        netlist = copy(self.netlist)
+        netlist.outputs = netlist.outputs[:self._get_outputs_count()]
+        return netlist
+
+    def _get_reference_outputs(self, words):
+        """Output values of word-level model for dict of signals names and integer values (or arrays of them)"""
+        raise ReferenceModelNotSpecified(self.__class__.__name__)
+
+    def evaluate_reference(self, **kwargs):
+        """Output values computed by word-level model for integer values of signals (first=5 or first_signals=5)"""
+        words = dict()
+        for key, value in kwargs.iteritems():
+            signals_name = key if key.endswith('_signals') else '%s_signals' % key
+            if signals_name not in self._get_data_signals_names():
+                raise SignalsNotSpecified((key,))
+            words[signals_name] = long(value) & (2 ** len(self[signals_name]) - 1)
+        unknown_signals = [signals_name for signals_name in self._get_data_signals_names() if signals_name not in words]
+        if unknown_signals:
+            raise SignalsNotSpecified(tuple(unknown_signals))
+        outputs = self._get_reference_outputs(words)
+        return [1 if output else 0 for output in outputs[:len(self.output_signals)]]
+
+    def check_reference(self, vectors_count=None, chunk_size=65536, seed=None):
+        """Compare functions with word-level model on random input vectors or on all of them if count is None.
+
+        Vectors are evaluated by chunks of NumPy arrays. Returns number of vectors, number of mismatches
+        and values of signals for the first mismatch.
+        """
+        signals_names = self._get_data_signals_names()
+        signals_list = [self[signals_name] for signals_name in signals_names]
+        signals_count = sum([len(signals) for signals in signals_list])
+        is_exhaustive = vectors_count is None
+        if is_exhaustive:
+            vectors_count = 2 ** signals_count
+        # Words wider than 64 bits are Python integers
+        dtype = numpy.uint64 if max([len(signals) for signals in signals_list]) <= 64 else object
+        random_state = numpy.random.RandomState(seed)
+        outputs_count = self._get_outputs_count()
+        values = self._get_constant_subs()
+        report = {'vectors': vectors_count, 'mismatches': 0, 'counterexample': None}
+        for start in xrange(0, vectors_count, chunk_size):
+            stop = min(start + chunk_size, vectors_count)
+            if is_exhaustive:
+                input_columns = generate_input_matrix(signals_list, start, stop)
+            else:
+                input_columns = list(random_state.randint(0, 2, size=(signals_count, stop - start)).astype(numpy.bool_))
+            values.update(zip([str(signal) for signals in signals_list for signal in signals], input_columns))
+            words = dict()
+            column_index = 0
+            for signals_name, signals in zip(signals_names, signals_list):
+                words[signals_name] = get_words(input_columns[column_index:column_index + len(signals)], dtype)
+                column_index += len(signals)
+            outputs = self._evaluate_compiled(True, values)[:outputs_count]
+            reference_outputs = self._get_reference_outputs(words)[:outputs_count]
+            mismatches = numpy.zeros(stop - start, dtype=numpy.bool_)
+            for output, reference_output in zip(outputs, reference_outputs):
+                mismatches |= (numpy.asarray(output) != 0) != (numpy.asarray(reference_output) != 0)
+            report['mismatches'] += int(numpy.count_nonzero(mismatches))
+            if report['counterexample'] is None and mismatches.any():
+                i = numpy.flatnonzero(mismatches)[0]
+                report['counterexample'] = dict([(signals_name, long(words[signals_name][i]))
+                                                 for signals_name in signals_names])
+        return report
+
+    def _generate_functions(self):
+        if self._get_generated_netlist() is None:
+            raise LogicFunctionNotSpecified(self.__class__.__name__)
+        return self._get_functions_of_netlist()
+
+    def _generate_hierarchy(self):
+        """Instances of sub-devices (see circuitry.devices.hierarchy.DeviceInstance) in order of evaluation and nets
+        of outputs for devices built of instances, None for the others
+        """
+        return None
+
+    def flatten(self):
+        """Netlist of device with instances replaced by netlists of their devices, flattened only on request"""
+        if self.hierarchy is None:
+            return self.netlist
+        instances, output_nets = self.hierarchy
+        netlist = Netlist(self._get_input_names())
+        nodes = flatten_instances(netlist, dict([(netlist.values[node], node) for node in netlist.inputs]), instances)
+        netlist.outputs = [nodes[net] if net in nodes else netlist.add_input(net) for net in output_nets]
+        return netlist
+
+    def _get_data_signals_names(self):
+        """Names of input signals except strobe ones"""
+        return [signals_name for signals_name in self.mandatory_signals
+                if signals_name not in ('strobe_signals', 'output_signals')]
+
+    def _get_width(self):
+        """Width of device compared with default_architecture_max_width, the largest number of data signals"""
+        return max([len(self[signals_name]) for signals_name in self._get_data_signals_names()] or [0])
+
+    def _get_architecture(self):
+        """Architecture from keyword argument or the default one for width of device"""
+        if 'architecture' in self:
+            return self['architecture']
+        if self.default_architecture_max_width is not None and self._get_width() > self.default_architecture_max_width:
+            return self.default_wide_architecture
+        return self.default_architecture
+
+    def _generate_truth_table(self):
+        """Truth table over all input signals except strobe ones"""
+        return self._generate_through_truth_table([self[signals_name]
+                                                   for signals_name in self._get_data_signals_names()])
+
+    def get_output_truth_table(self, output):
+        """Truth table of one output (number or name of output signal) projected onto its support (see supports).
+
+        Rows are enumerated only for 2 ** len(support) values of input signals the output depends on, lines of input
+        signals keep their order and leave out the other signals, which are 0 for evaluation.
+        """
+        output_names = [str(signal) for signal in self.output_signals[:self._get_outputs_count()]]
+        if str(output) in output_names:
+            output = output_names.index(str(output))
+        elif not isinstance(output, (int, long)) or not 0 <= output < len(output_names):
+            raise SignalsNotSpecified((output,))
+        support = set(self.supports[output])
+        return self._generate_through_truth_table([[signal for signal in self[signals_name] if str(signal) in support]
+                                                   for signals_name in self._get_data_signals_names()], output)
+
+    def _generate_through_truth_table(self, signals_list=None, output=None):
+        """Truth table over signals of signals_list for all outputs or for output number output only, the other input
+        signals (except strobe ones) are 0
+        """
         if not signals_list:
-            return
-        strobe_signals = False
+            return TruthTable()
+        evaluation_backend = self.get('evaluation_backend', self.default_evaluation_backend)
+        if evaluation_backend not in self.evaluation_backends:
+            raise EvaluationBackendNotSupported(evaluation_backend)
+        strobe_signals_truth_table = list()
         if 'strobe_signals' in self.mandatory_signals:
-            strobe_signals = True
+            strobe_signals_truth_table = [list(self.strobe_signals_truth_table)]
+        line_subs = dict([(name, 0) for name in self._get_input_names()])
+        line_subs.update(self._get_constant_subs())
+        for signals in signals_list:
+            for signal in signals:
+                line_subs.pop(str(signal), None)
+        lines_function = getattr(self, self.evaluation_backends[evaluation_backend])(
+            signals_list, line_subs, self._get_outputs_count() if output is None else output + 1)
+        if output is not None:
+            outputs_lines_function = lines_function
+
+            def _output_lines_function(start, stop):
+                lines_columns = list(outputs_lines_function(start, stop))
+                lines_columns[-1] = lines_columns[-1][output:output + 1]
+                return lines_columns
+            lines_function = _output_lines_function
+        return self._get_truth_table(strobe_signals_truth_table, lines_function,
+                                     2 ** sum([len(signals) for signals in signals_list]))
+
+    def _get_truth_table(self, prefix, lines_function, rows_count):
+        workers = self.get('workers', self.default_workers)
+        if self.get('streaming', self.default_streaming):
+            return StreamingTruthTable(prefix, lines_function, rows_count)
+        elif workers > 1:
+            return TruthTable(prefix, generate_packed_lines(lines_function, rows_count, workers), rows_count)
+        return TruthTable.from_columns(prefix, lines_function(0, rows_count), rows_count)
+
+    def _generate_truth_table_by_rows(self, prefix, rows_function, rows_count):
+        """Truth table from function of row number returning lines of the row except prefix"""
+        def _lines_function(start, stop):
+            rows = [rows_function(i) for i in xrange(start, stop)]
+            return [zip(*line_rows) for line_rows in zip(*rows)]
+        return self._get_truth_table(prefix, _lines_function, rows_count)
+
+    def _truth_table_evaluator_by_sympy(self, signals_list, constant_subs, outputs_count):
+        functions = self.functions[:outputs_count]
         input_signals_len = sum([len(signals) for signals in signals_list])
-        for bin_i in range(0, 2 ** input_signals_len):
-            lines = [list() for _ in range(0, len(signals_list))]
-            lines_index, value_index = 0, 0
-            for line_value in generate_binary_lines_current(input_signals_len, bin_i):
-                lines[lines_index].append(line_value)
-                value_index += 1
-                if value_index >= len(signals_list[lines_index]):
-                    value_index = 0
-                    lines_index += 1
-            for line in lines:
-                line.reverse()
-            line_subs = dict()
-            for signals_i in range(0, len(signals_list)):
-                for i in range(0, len(signals_list[signals_i])):
-                    line_subs[str(signals_list[signals_i][i])] = lines[signals_i][i]
-            strobe_signals_truth_table = list()
-            if strobe_signals:
-                line_subs.update(self.strobe_signals_subs)
-                strobe_signals_truth_table = [self.strobe_signals_truth_table]
-            y_line = list()
-            max_length = min(len(self.output_signals), len(self.functions))
-            for i in range(0, max_length):
-                y_line.append(1 if self.functions[i].subs(line_subs) else 0)
-            self.truth_table.append(tuple(strobe_signals_truth_table + lines +
-                                          [y_line[:max_length]]))
\ No newline at end of file
+
+        def _lines_function(start, stop):
+            lines_columns = [list() for _ in range(0, len(signals_list) + 1)]
+            for bin_i in range(start, stop):
+                lines = [list() for _ in range(0, len(signals_list))]
+                lines_index, value_index = 0, 0
+                for line_value in generate_binary_lines_current(input_signals_len, bin_i):
+                    lines[lines_index].append(line_value)
+                    value_index += 1
+                    if value_index >= len(signals_list[lines_index]):
+                        value_index = 0
+                        lines_index += 1
+                for line in lines:
+                    line.reverse()
+                line_subs = dict()
+                for signals_i in range(0, len(signals_list)):
+                    for i in range(0, len(signals_list[signals_i])):
+                        line_subs[str(signals_list[signals_i][i])] = lines[signals_i][i]
+                line_subs.update(constant_subs)
+                y_line = [1 if function.subs(line_subs) else 0 for function in functions]
+                for line_columns, line in zip(lines_columns, lines + [y_line]):
+                    line_columns.append(line)
+            return [zip(*line_columns) for line_columns in lines_columns]
+        return _lines_function
+
+    def _truth_table_evaluator_by_numpy(self, signals_list, constant_subs, outputs_count):
+        functions = self.functions[:outputs_count]
+        signal_names = [str(signal) for signals in signals_list for signal in signals]
+        kernel = NumpyKernel(functions)
+
+        def _lines_function(start, stop):
+            input_columns = generate_input_matrix(signals_list, start, stop)
+            columns = dict(constant_subs)
+            columns.update(zip(signal_names, input_columns))
+            lines_columns = list()
+            column_index = 0
+            for signals in signals_list:
+                lines_columns.append(input_columns[column_index:column_index + len(signals)])
+                column_index += len(signals)
+            lines_columns.append(kernel(columns, stop - start) if functions else list())
+            return lines_columns
+        return _lines_function
+
+    def _truth_table_evaluator_by_compiled(self, signals_list, constant_subs, outputs_count):
+        signal_names = [str(signal) for signals in signals_list for signal in signals]
+
+        def _lines_function(start, stop):
+            input_columns = generate_input_matrix(signals_list, start, stop)
+            values = dict(constant_subs)
+            values.update(zip(signal_names, input_columns))
+            lines_columns = list()
+            column_index = 0
+            for signals in signals_list:
+                lines_columns.append(input_columns[column_index:column_index + len(signals)])
+                column_index += len(signals)
+            outputs = self._evaluate_compiled(True, values)[:outputs_count]
+            # Constant outputs are broadcast to all rows
+            lines_columns.append([numpy.zeros(stop - start, dtype=numpy.bool_) | output for output in outputs])
+            return lines_columns
+        return _lines_function
+
+    def _truth_table_evaluator_by_gray_code(self, signals_list, constant_subs, outputs_count):
+        # Last signals of truth table are the lowest bits of row number
+        input_names = [signal for signals in reversed(signals_list) for signal in signals]
+        netlist, _ = self._get_compiled_functions()
+        gray_code_sweep = GrayCodeSweep(netlist, input_names, constant_subs)
+
+        def _lines_function(start, stop):
+            lines_columns = list()
+            input_columns = generate_input_matrix(signals_list, start, stop)
+            column_index = 0
+            for signals in signals_list:
+                lines_columns.append(input_columns[column_index:column_index + len(signals)])
+                column_index += len(signals)
+            y_lines = [None] * (stop - start)
+            for row, output_values in gray_code_sweep.sweep(start, stop):
+                y_lines[row - start] = output_values[:outputs_count]
+            lines_columns.append(numpy.array(y_lines, dtype=numpy.bool_).reshape(stop - start, outputs_count).T)
+            return lines_columns
+        return _lines_function
@@ -8,7 +8,63 @@ __copyright__ = 'Copyright 2014, The Profitware Group'
 from sympy.logic import *
 
 from circuitry.devices import Device
+from circuitry.devices.hierarchy import DeviceInstance, add_instance_netlist
+from circuitry.devices.mux import DeviceMux
 from circuitry.devices.simple import DeviceNot
+from circuitry.logic.netlist import Netlist
+from circuitry.logic.prefix import generate_adder_netlist
+
+
+def get_architecture_statistics(device):
+    """Gate count and logic depth of netlist device is evaluated by (see Device.netlist)"""
+    netlist = device.netlist
+    outputs = netlist.outputs[:len(device.output_signals)]
+    return {
+        'architecture': device._get_architecture(),
+        'gates': netlist.count_gates(outputs),
+        'depth': netlist.get_depth(outputs)
+    }
+
+
+def get_prefix_netlist(device, adder_netlist):
+    """Netlist of first outputs of adder netlist and-ed with strobe function, built directly without sympy functions"""
+    netlist = Netlist(device._get_input_names())
+    enable = netlist.add_function(device.strobe_signals_function)
+    outputs = add_instance_netlist(netlist, adder_netlist, dict())[:len(device.output_signals)]
+    netlist.outputs = [netlist.add_gate('and', (enable, output)) for output in outputs]
+    return netlist
+
+
+def get_adder_reference_outputs(first, second, width):
+    """Sum bits, carry and two's complement overflow of integers (or arrays of integers) of width bits"""
+    # Sum is used only below width bits, so it may wrap around for 64 bits words, carries are computed without it
+    total = first + second
+    previous_carry = ((first & (2 ** (width - 1) - 1)) + (second & (2 ** (width - 1) - 1))) >> (width - 1)
+    carry = ((first >> (width - 1)) + (second >> (width - 1)) + previous_carry) >> 1
+    return [(total >> i) & 1 for i in xrange(0, width)] + [carry, previous_carry ^ carry]
+
+
+def get_complement_reference_outputs(outputs, data, width):
+    """Outputs for negative data (the most significant bit is set) and data bits for the others"""
+    sign = (data >> (width - 1)) & 1
+    return [(sign & output) | ((sign ^ 1) & (data >> i) & 1) if i < width else output
+            for i, output in enumerate(outputs)]
+
+
+def get_selection_instances(device, negative_nets, positive_nets):
+    """Instances of one 2:1 multiplexer selecting negative nets if the most significant data signal is set and
+    positive nets otherwise
+    """
+    signals_kwargs = device._get_signals_kwargs()
+    device_mux = DeviceMux.cached(strobe_signals=signals_kwargs['strobe_signals'],
+                                  address_signals='a:1',
+                                  data_signals='d:2',
+                                  output_signals='y:1',
+                                  strobe_signals_subs=signals_kwargs['strobe_signals_subs'],
+                                  output_signals_subs=dict(y0=1))
+    return [DeviceInstance('select%d' % i, device_mux, dict(a0=device.data_signals[-1], d0=positive_net,
+                                                            d1=negative_net))
+            for i, (negative_net, positive_net) in enumerate(zip(negative_nets, positive_nets))]
 
 
 class DeviceAdd(Device):
@@ -25,23 +81,44 @@ class DeviceAdd(Device):
         },
         'first_signals': {
             'min': 1,
-            'max': 5
+            'max': 64
         },
         'second_signals': {
             'min': 1,
-            'max': 5
+            'max': 64
         },
         'output_signals': {
             'min': 1,
-            'max': 7
+            'max': 66
         }
     }
+    functions_options = ('architecture',)
+    # Carry network: 'ripple', 'kogge-stone', 'brent-kung' or 'sklansky', may be overridden by architecture keyword
+    # argument. Functions of ripple carry adders keep nested majority form, the others are built as prefix netlist.
+    # Nested majority functions grow exponentially with width, so operands wider than 5 bits use Brent-Kung network
+    default_architecture = 'ripple'
+    default_architecture_max_width = 5
+    default_wide_architecture = 'brent-kung'
+
+    def _generate_adder_netlist(self):
+        return generate_adder_netlist(self.first_signals, self.second_signals,
+                                      self._get_architecture())
+
+    @property
+    def architecture_statistics(self):
+        return get_architecture_statistics(self)
+
+    def _generate_netlist(self):
+        if self._get_architecture() != 'ripple':
+            return get_prefix_netlist(self, self._generate_adder_netlist())
+        return None
 
-    def __init__(self, **kwargs):
-        super(DeviceAdd, self).__init__(**kwargs)
+    def _generate_functions(self):
+        if self._get_architecture() != 'ripple':
+            return self._get_functions_of_netlist()
         function_s = lambda vx, vy, vp: Xor(vx, vy, vp)
         function_p = lambda vx, vy, vp: Or(And(vx, vy), And(vx, vp), And(vy, vp))
-        self.functions = list()
+        functions = list()
         current_p, prev_p = 0, 0
         for i in range(0, max(len(self.first_signals), len(self.second_signals))):
             try:
@@ -55,10 +132,14 @@ class DeviceAdd(Device):
             current_s = function_s(x, y, current_p)
             prev_p = current_p
             current_p = function_p(x, y, current_p)
-            self.functions.append(self.strobe_signals_function & current_s)
-        self.functions.append(self.strobe_signals_function & current_p)  # Overflow
-        self.functions.append(self.strobe_signals_function & Xor(prev_p, current_p))  # Two's complement overflow
-        self._generate_through_truth_table(signals_list=(self.first_signals, self.second_signals))
+            functions.append(self.strobe_signals_function & current_s)
+        functions.append(self.strobe_signals_function & current_p)  # Overflow
+        functions.append(self.strobe_signals_function & Xor(prev_p, current_p))  # Two's complement overflow
+        return functions
+
+    def _get_reference_outputs(self, words):
+        return get_adder_reference_outputs(words['first_signals'], words['second_signals'],
+                                           max(len(self.first_signals), len(self.second_signals)))
 
 
 class DeviceInc(Device):
@@ -73,26 +154,46 @@ class DeviceInc(Device):
         },
         'data_signals': {
             'min': 1,
-            'max': 5
+            'max': 64
         },
         'output_signals': {
             'min': 1,
-            'max': 7
+            'max': 66
         }
     }
+    functions_options = ('architecture',)
+    # Carry network, see DeviceAdd
+    default_architecture = 'ripple'
+    default_architecture_max_width = 5
+    default_wide_architecture = 'brent-kung'
+
+    def _generate_adder_netlist(self):
+        return generate_adder_netlist([1], self.data_signals,
+                                      self._get_architecture())
 
-    def __init__(self, **kwargs):
-        super(DeviceInc, self).__init__(**kwargs)
-        inc_dict = kwargs.copy()
+    @property
+    def architecture_statistics(self):
+        return get_architecture_statistics(self)
+
+    def _generate_hierarchy(self):
+        # Ripple carry incrementer is adder with constant 1 as the first operand
+        if self._get_architecture() != 'ripple':
+            return None
+        inc_dict = self._get_signals_kwargs()
         inc_dict.update({
             'first_signals': 't:1',
-            'second_signals': kwargs['data_signals']
+            'second_signals': inc_dict['data_signals']
         })
-        inc_adder = DeviceAdd(**inc_dict)
-        self.functions = list()
-        for function in inc_adder.functions[:len(self.output_signals)]:
-            self.functions.append(self.strobe_signals_function & function.subs({'t0': 1}))
-        self._generate_through_truth_table(signals_list=(self.data_signals,))
+        inc_adder = DeviceInstance('adder', DeviceAdd.cached(**inc_dict), dict(t0=1))
+        return [inc_adder], inc_adder.output_nets[:len(self.output_signals)]
+
+    def _generate_netlist(self):
+        if self._get_architecture() != 'ripple':
+            return get_prefix_netlist(self, self._generate_adder_netlist())
+        return self.flatten()
+
+    def _get_reference_outputs(self, words):
+        return get_adder_reference_outputs(words['data_signals'], 1, len(self.data_signals))
 
 
 class DeviceDec(Device):
@@ -107,59 +208,84 @@ class DeviceDec(Device):
         },
         'data_signals': {
             'min': 1,
-            'max': 5
+            'max': 64
         },
         'output_signals': {
             'min': 1,
-            'max': 7
+            'max': 66
         }
     }
+    functions_options = ('architecture',)
+    # Carry network, see DeviceAdd
+    default_architecture = 'ripple'
+    default_architecture_max_width = 5
+    default_wide_architecture = 'brent-kung'
+
+    def _generate_adder_netlist(self):
+        return generate_adder_netlist([1] * len(self.data_signals), self.data_signals,
+                                      self._get_architecture())
+
+    @property
+    def architecture_statistics(self):
+        return get_architecture_statistics(self)
 
-    def __init__(self, **kwargs):
-        super(DeviceDec, self).__init__(**kwargs)
-        dec_dict = kwargs.copy()
+    def _generate_hierarchy(self):
+        # Ripple carry decrementer is adder with constant -1 (all ones) as the first operand
+        if self._get_architecture() != 'ripple':
+            return None
+        dec_dict = self._get_signals_kwargs()
         dec_dict.update({
             'first_signals': 't:%d' % len(self.data_signals),
-            'second_signals': kwargs['data_signals']
+            'second_signals': dec_dict['data_signals']
         })
-        dec_adder = DeviceAdd(**dec_dict)
-        self.functions = list()
-        dec_subs = {'t%d' % i: 1 for i in range(0, len(self.data_signals))}
-        for function in dec_adder.functions[:len(self.output_signals)]:
-            self.functions.append(self.strobe_signals_function & function.subs(dec_subs))
-        self._generate_through_truth_table(signals_list=(self.data_signals,))
+        dec_adder = DeviceInstance('adder', DeviceAdd.cached(**dec_dict),
+                                   dict([('t%d' % i, 1) for i in range(0, len(self.data_signals))]))
+        return [dec_adder], dec_adder.output_nets[:len(self.output_signals)]
+
+    def _generate_netlist(self):
+        if self._get_architecture() != 'ripple':
+            return get_prefix_netlist(self, self._generate_adder_netlist())
+        return self.flatten()
+
+    def _get_reference_outputs(self, words):
+        return get_adder_reference_outputs(words['data_signals'], 2 ** len(self.data_signals) - 1,
+                                           len(self.data_signals))
 
 
 class Device12Comp(DeviceInc):
     """Ones' complement to two's complement device"""
 
-    def __init__(self, **kwargs):
-        super(Device12Comp, self).__init__(**kwargs)
-        for i in range(0, len(self.data_signals)):
-            self.functions[i] = And(
-                self.strobe_signals_function,
-                Or(
-                    And(self.data_signals[-1], self.functions[i]),
-                    And(Not(self.data_signals[-1]), self.data_signals[i])
-                )
-            )
-        self._generate_through_truth_table(signals_list=(self.data_signals,))
+    def _generate_hierarchy(self):
+        # Negative data are incremented, the others are passed through
+        inc = DeviceInstance('inc', DeviceInc.cached(**self._get_signals_kwargs()))
+        selection_instances = get_selection_instances(self, inc.output_nets, self.data_signals)
+        return [inc] + selection_instances, \
+            [instance.output_nets[0] for instance in selection_instances] + inc.output_nets[len(self.data_signals):]
+
+    def _generate_netlist(self):
+        return self.flatten()
+
+    def _get_reference_outputs(self, words):
+        return get_complement_reference_outputs(super(Device12Comp, self)._get_reference_outputs(words),
+                                                words['data_signals'], len(self.data_signals))
 
 
 class Device21Comp(DeviceDec):
     """Two's complement to ones' complement device"""
 
-    def __init__(self, **kwargs):
-        super(Device21Comp, self).__init__(**kwargs)
-        for i in range(0, len(self.data_signals)):
-            self.functions[i] = And(
-                self.strobe_signals_function,
-                Or(
-                    And(self.data_signals[-1], self.functions[i]),
-                    And(Not(self.data_signals[-1]), self.data_signals[i])
-                )
-            )
-        self._generate_through_truth_table(signals_list=(self.data_signals,))
+    def _generate_hierarchy(self):
+        # Negative data are decremented, the others are passed through
+        dec = DeviceInstance('dec', DeviceDec.cached(**self._get_signals_kwargs()))
+        selection_instances = get_selection_instances(self, dec.output_nets, self.data_signals)
+        return [dec] + selection_instances, \
+            [instance.output_nets[0] for instance in selection_instances] + dec.output_nets[len(self.data_signals):]
+
+    def _generate_netlist(self):
+        return self.flatten()
+
+    def _get_reference_outputs(self, words):
+        return get_complement_reference_outputs(super(Device21Comp, self)._get_reference_outputs(words),
+                                                words['data_signals'], len(self.data_signals))
 
 
 class DeviceNeg(Device):
@@ -174,42 +300,29 @@ class DeviceNeg(Device):
         },
         'data_signals': {
             'min': 1,
-            'max': 5
+            'max': 64
         },
         'output_signals': {
             'min': 1,
-            'max': 5
+            'max': 64
         }
     }
 
-    def __init__(self, **kwargs):
-        super(DeviceNeg, self).__init__(**kwargs)
-        not_inc_kwargs = kwargs.copy()
-        not_inc_kwargs['data_signals'] = 'n' + not_inc_kwargs['data_signals'][1:]
-        device_not_inc = DeviceNot(**not_inc_kwargs)
-        inc_kwargs = kwargs.copy()
-        inc_kwargs['data_signals'] = 'i' + inc_kwargs['data_signals'][1:]
-        device_inc = DeviceInc(**inc_kwargs)
-        dec_kwargs = kwargs.copy()
-        dec_kwargs['data_signals'] = 'm' + dec_kwargs['data_signals'][1:]
-        device_dec = DeviceDec(**dec_kwargs)
-        not_dec_kwargs = kwargs.copy()
-        not_dec_kwargs['data_signals'] = 'b' + not_dec_kwargs['data_signals'][1:]
-        device_not_dec = DeviceNot(**not_dec_kwargs)
-        self.functions = list()
-        subs_dict = dict()
-        for i in range(0, len(self.data_signals)):
-            subs_dict[str(device_not_inc.data_signals[i])] = self.data_signals[i]
-            subs_dict[str(device_inc.data_signals[i])] = device_not_inc.functions[i].subs(subs_dict)
-            subs_dict[str(device_dec.data_signals[i])] = self.data_signals[i]
-            subs_dict[str(device_not_dec.data_signals[i])] = device_dec.functions[i].subs(subs_dict)
-            self.functions.append(
-                And(
-                    self.strobe_signals_function,
-                    Or(
-                        And(self.data_signals[-1], device_inc.functions[i].subs(subs_dict)),  # Negative
-                        And(Not(self.data_signals[-1]), device_not_dec.functions[i].subs(subs_dict))  # Positive
-                    )
-                )
-            )
-        self._generate_through_truth_table(signals_list=(self.data_signals,))
+    def _generate_hierarchy(self):
+        # Negative data are inverted and incremented, the others are decremented and inverted
+        width = len(self.data_signals)
+        kwargs = self._get_signals_kwargs()
+        kwargs.update(data_signals='n:%d' % width, output_signals='y:%d' % width)
+        device_not = DeviceNot.cached(data_signals=kwargs['data_signals'], output_signals=kwargs['output_signals'])
+        device_inc = DeviceInc.cached(**kwargs)
+        device_dec = DeviceDec.cached(**kwargs)
+        not_inc = DeviceInstance('not_inc', device_not, dict(zip(device_not.data_signals, self.data_signals)))
+        inc = DeviceInstance('inc', device_inc, dict(zip(device_inc.data_signals, not_inc.output_nets)))
+        dec = DeviceInstance('dec', device_dec, dict(zip(device_dec.data_signals, self.data_signals)))
+        not_dec = DeviceInstance('not_dec', device_not, dict(zip(device_not.data_signals, dec.output_nets)))
+        selection_instances = get_selection_instances(self, inc.output_nets, not_dec.output_nets)
+        return [not_inc, inc, dec, not_dec] + selection_instances, \
+            [instance.output_nets[0] for instance in selection_instances]
+
+    def _get_reference_outputs(self, words):
+        return [((-words['data_signals']) >> i) & 1 for i in xrange(0, len(self.data_signals))]
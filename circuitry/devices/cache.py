@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from collections import OrderedDict
+from copy import deepcopy
+from threading import RLock
+
+from circuitry.exceptions import DeviceFrozen
+
+
+def get_canonical_value(value):
+    """Hashable value which does not depend on order of dict items"""
+    if isinstance(value, dict):
+        return tuple(sorted([(key, get_canonical_value(item)) for key, item in value.iteritems()]))
+    if isinstance(value, (list, tuple)):
+        return tuple([get_canonical_value(item) for item in value])
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted([get_canonical_value(item) for item in value]))
+    return value
+
+
+class FrozenDict(dict):
+    """Read-only dict, e.g. substitutions of signals of frozen devices"""
+
+    def _check_not_frozen(self, *args, **kwargs):
+        raise DeviceFrozen(self)
+
+    __setitem__ = __delitem__ = update = setdefault = pop = popitem = clear = _check_not_frozen
+
+    def __reduce__(self):
+        # Copies are created from items, not by setting them one by one
+        return self.__class__, (dict(self),)
+
+
+class DeviceCache(object):
+    """Size-bounded LRU cache of constructed devices keyed by device class and keyword arguments.
+
+    Cached devices are frozen and shared between all callers, they are constructed from copies of keyword arguments,
+    so later changes of arguments do not change cached devices.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._devices = OrderedDict()
+        self._lock = RLock()
+
+    def get_device(self, device_class, **kwargs):
+        key = (device_class, get_canonical_value(kwargs))
+        with self._lock:
+            if key in self._devices:
+                self.hits += 1
+                device = self._devices.pop(key)
+                self._devices[key] = device
+                return device
+            self.misses += 1
+        # Devices are constructed outside of lock, concurrent constructions of the same device give equal results
+        device = device_class(**deepcopy(kwargs))
+        device.freeze()
+        with self._lock:
+            device = self._devices.pop(key, device)
+            self._devices[key] = device
+            while len(self._devices) > max(self.max_size, 0):
+                self._devices.popitem(last=False)
+                self.evictions += 1
+        return device
+
+    def clear(self):
+        with self._lock:
+            self._devices.clear()
+            self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def __len__(self):
+        return len(self._devices)
+
+    @property
+    def statistics(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._devices),
+            'max_size': self.max_size
+        }
+
+
+device_cache = DeviceCache()
+
+
+def get_device(device_class, **kwargs):
+    """Device from process-wide cache, constructed on first request"""
+    return device_cache.get_device(device_class, **kwargs)
@@ -8,6 +8,8 @@ __copyright__ = 'Copyright 2014, The Profitware Group'
 from sympy.logic import *
 
 from circuitry.devices import Device
+from circuitry.exceptions import ArchitectureNotSupported
+from circuitry.logic.cmp import generate_comparator_netlist
 
 
 class DeviceEq(Device):
@@ -24,36 +26,66 @@ class DeviceEq(Device):
         },
         'first_signals': {
             'min': 1,
-            'max': 7
+            'max': 64
         },
         'second_signals': {
             'min': 1,
-            'max': 7
+            'max': 64
         },
         'output_signals': {
             'min': 1,
-            'max': 7
+            'max': 64
         }
     }
+    functions_options = ('architecture',)
+    # Equality of words and higher bits for each bit ('chain') or balanced tree of comparisons of parts of words
+    # ('tree'), may be overridden by architecture keyword argument. Chain grows quadratically with width, tree has
+    # logarithmic depth and linear size
+    architectures = ('chain', 'tree')
+    default_architecture = 'chain'
 
-    def __init__(self, **kwargs):
-        super(DeviceEq, self).__init__(**kwargs)
+    def _is_tree(self):
+        architecture = self.get('architecture', self.default_architecture)
+        if architecture not in self.architectures:
+            raise ArchitectureNotSupported(architecture)
+        return architecture == 'tree'
+
+    def _generate_netlist(self):
+        if not self._is_tree() or len(self.output_signals) != 1:
+            return None
+        return generate_comparator_netlist(self.first_signals, self.second_signals, [self.strobe_signals_function],
+                                           self._get_input_names(), equality_only=True)
+
+    def _generate_functions(self):
+        if self._is_tree() and len(self.output_signals) == 1:
+            return self._get_functions_of_netlist()
         functions = [Not(Xor(Ai, Bi)) for Ai, Bi in zip(self.first_signals, self.second_signals)]
         if len(self.output_signals) == 1:
-            self.functions = [reduce(And, functions, True)]
-        else:
-            self.functions = functions
-        self.functions = map(lambda Fi: And(self.strobe_signals_function, Fi), self.functions)
-        self._generate_through_truth_table(signals_list=(self.first_signals, self.second_signals))
+            functions = [reduce(And, functions, True)]
+        return map(lambda Fi: And(self.strobe_signals_function, Fi), functions)
+
+    def _get_reference_outputs(self, words):
+        width = min(len(self.first_signals), len(self.second_signals))
+        difference = words['first_signals'] ^ words['second_signals']
+        if len(self.output_signals) == 1:
+            return [difference & (2 ** width - 1) == 0]
+        return [((difference >> i) & 1) ^ 1 for i in xrange(0, width)]
 
 
 class DeviceCmp(DeviceEq):
     """Digital comparator device"""
 
-    def __init__(self, **kwargs):
-        super(DeviceCmp, self).__init__(**kwargs)
+    def _generate_netlist(self):
+        if not self._is_tree():
+            return None
+        return generate_comparator_netlist(self.first_signals, self.second_signals, [self.strobe_signals_function],
+                                           self._get_input_names())
+
+    def _generate_functions(self):
+        if self._is_tree():
+            return self._get_functions_of_netlist()
         input_signals_len = max(len(self.first_signals), len(self.second_signals))
-        functions_eq = self.functions
+        functions_eq = super(DeviceCmp, self)._generate_functions()
         functions_eq_parts = [reduce(And, functions_eq[i:], True) for i in range(1, input_signals_len)] + [True]
         function_gt = reduce(Or, [
             And(Ai, Not(Bi), Xi) for Ai, Bi, Xi in zip(self.first_signals, self.second_signals, functions_eq_parts)
@@ -61,6 +93,10 @@ class DeviceCmp(DeviceEq):
         function_lt = reduce(Or, [
             And(Not(Ai), Bi, Xi) for Ai, Bi, Xi in zip(self.first_signals, self.second_signals, functions_eq_parts)
         ], False)
-        self.functions = map(lambda Fi: And(self.strobe_signals_function, Fi),
-                             [function_lt, reduce(And, functions_eq, True), function_gt])
-        self._generate_through_truth_table(signals_list=(self.first_signals, self.second_signals))
\ No newline at end of file
+        return map(lambda Fi: And(self.strobe_signals_function, Fi),
+                   [function_lt, reduce(And, functions_eq, True), function_gt])
+
+    def _get_reference_outputs(self, words):
+        mask = 2 ** min(len(self.first_signals), len(self.second_signals)) - 1
+        first, second = words['first_signals'] & mask, words['second_signals'] & mask
+        return [first < second, first == second, first > second]
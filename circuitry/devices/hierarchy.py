@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+
+def is_constant_net(net):
+    return isinstance(net, (bool, int, long))
+
+
+class DeviceInstance(object):
+    """Named instance of device with input signals bound to nets of parent device.
+
+    Nets are names of input signals of parent device, output nets of preceding instances or constants 0 and 1,
+    input signals which are not bound are connected to nets of the same names (e.g. strobe signals). Instances of
+    one device (e.g. from Device.cached) share its compiled function and netlist.
+    """
+
+    def __init__(self, name, device, bindings=None):
+        self.name = name
+        self.device = device
+        self.bindings = dict([(str(signal), net if is_constant_net(net) else str(net))
+                              for signal, net in (bindings or dict()).iteritems()])
+
+    @property
+    def input_nets(self):
+        """Nets bound to input signals of device, in order of them"""
+        return [self.bindings.get(name, name) for name in self.device._get_input_names()]
+
+    @property
+    def output_nets(self):
+        """Nets of outputs of device named like 'instance.y0'"""
+        return ['%s.%s' % (self.name, signal)
+                for signal in self.device.output_signals[:self.device._get_outputs_count()]]
+
+    def __repr__(self):
+        return '%s(%r, %s)' % (self.__class__.__name__, self.name, self.device.__class__.__name__)
+
+
+def add_instance_netlist(netlist, instance_netlist, input_nodes):
+    """Add nodes of instance netlist used by its outputs to netlist, its inputs are replaced by input_nodes (dict
+    of nodes by names of inputs). Returns nodes of netlist for outputs of instance netlist.
+    """
+    nodes = dict()
+    for node in instance_netlist.reachable_nodes():
+        operation = instance_netlist.operations[node]
+        if operation == 'input':
+            name = instance_netlist.values[node]
+            nodes[node] = input_nodes[name] if name in input_nodes else netlist.add_input(name)
+        elif operation == 'constant':
+            nodes[node] = netlist.add_constant(instance_netlist.values[node])
+        else:
+            nodes[node] = netlist.add_gate(operation, [nodes[operand] for operand in instance_netlist.operands[node]])
+    return [nodes[node] for node in instance_netlist.outputs]
+
+
+def flatten_instances(netlist, nodes, instances):
+    """Add netlists of devices of instances to netlist, nodes of nets (dict by names) are updated with output nets"""
+    for instance in instances:
+        input_nodes = dict()
+        for name, net in zip(instance.device._get_input_names(), instance.input_nets):
+            if is_constant_net(net):
+                input_nodes[name] = netlist.add_constant(net)
+            else:
+                input_nodes[name] = nodes[net] if net in nodes else netlist.add_input(net)
+        nodes.update(zip(instance.output_nets, add_instance_netlist(netlist, instance.device.netlist, input_nodes)))
+    return nodes
@@ -8,6 +8,9 @@ __copyright__ = 'Copyright 2013, The Profitware Group'
 from sympy.logic import *
 
 from circuitry.devices import Device
+from circuitry.exceptions import ArchitectureNotSupported
+from circuitry.logic.minimize import minimize_sop
+from circuitry.logic.mux import generate_mux_tree_netlist, generate_decoder_netlist
 from . import generate_binary_lines_current
 
 
@@ -25,64 +28,101 @@ class DeviceMux(Device):
         },
         'address_signals': {
             'min': 1,
-            'max': 5
+            'max': 10
         },
         'data_signals': {
             'min': 1,
-            'max': 32
+            'max': 1024
         },
         'output_signals': {
             'min': 1,
             'max': 1
         }
     }
-
-    def _generate_function_in_cycle(self, address_line, i):
-        return Or(self.address_and_data_function, And(
-            SOPform(self.address_signals, [address_line]),
+    functions_options = ('architecture',)
+    # Sum of products ('sop') or balanced tree of 2:1 multiplexers ('tree'), may be overridden by architecture keyword
+    # argument. Sum of products is minimized for each address, so it is practical for up to 32 data signals only and
+    # devices with more than 5 address signals are trees by default
+    architectures = ('sop', 'tree')
+    default_architecture = 'sop'
+    default_architecture_max_width = 5
+    default_wide_architecture = 'tree'
+
+    def _get_width(self):
+        return len(self.address_signals)
+
+    def _generate_function_in_cycle(self, address_and_data_function, address_line, i):
+        return Or(address_and_data_function, And(
+            minimize_sop(self.address_signals, [address_line]),
             self.data_signals[i]
         ))
 
-    def _generate_function_after_cycle(self, address_and_data_minterms, address_and_data_exludes):
-        return self.address_and_data_function
-
-    def __init__(self, **kwargs):
-        super(DeviceMux, self).__init__(**kwargs)
+    def _generate_function_after_cycle(self, address_and_data_function, address_and_data_minterms,
+                                       address_and_data_exludes):
+        return address_and_data_function
+
+    def _generate_truth_table_line(self, i):
+        address_line = list()
+        for address_line_value in generate_binary_lines_current(len(self.address_signals), i):
+            address_line.append(address_line_value)
+        address_line.reverse()
+        data_line = len(self.data_signals) * [0]
+        if i < len(data_line):
+            data_line[i] = 1
+            y_line = list(self.output_signals_truth_table)
+        else:
+            y_line = map(lambda _y: 1 - _y, self.output_signals_truth_table)
+        return address_line, data_line, y_line
+
+    def _generate_netlist(self):
+        if self._get_architecture() != 'tree':
+            return None
+        return generate_mux_tree_netlist(self.address_signals, self.data_signals, [self.strobe_signals_function],
+                                         self._get_input_names())
+
+    def _generate_functions(self):
+        architecture = self._get_architecture()
+        if architecture not in self.architectures:
+            raise ArchitectureNotSupported(architecture)
+        if architecture == 'tree':
+            return self._get_functions_of_netlist()
         address_and_data_minterms = list()
         address_and_data_exludes = list()
 
-        self.truth_table = list()
-        self.address_and_data_function = 0
+        address_and_data_function = 0
 
         for i in range(0, 2 ** len(self.address_signals)):
-            address_line = list()
-            for address_line_value in generate_binary_lines_current(len(self.address_signals), i):
-                address_line.append(address_line_value)
-            address_line.reverse()
-            data_line = len(self.data_signals) * [0]
+            address_line, data_line, y_line = self._generate_truth_table_line(i)
             if i < len(data_line):
-                data_line[i] = 1
-                y_line = self.output_signals_truth_table
                 address_and_data_minterms.append(address_line + data_line)
             else:
                 address_and_data_exludes.append(address_line + data_line)
-                y_line = map(lambda _y: 1 - _y, self.output_signals_truth_table)
-            self.truth_table.append((self.strobe_signals_truth_table, address_line, data_line, y_line))
-            self.address_and_data_function = self._generate_function_in_cycle(address_line, i)
+            address_and_data_function = self._generate_function_in_cycle(address_and_data_function, address_line, i)
+
+        address_and_data_function = self._generate_function_after_cycle(address_and_data_function,
+                                                                         address_and_data_minterms,
+                                                                         address_and_data_exludes)
+        return [self.strobe_signals_function & address_and_data_function]
 
-        self.address_and_data_function = self._generate_function_after_cycle(address_and_data_minterms,
-                                                                              address_and_data_exludes)
-        self.functions = [self.strobe_signals_function & self.address_and_data_function]
+    def _generate_truth_table(self):
+        return self._generate_truth_table_by_rows([list(self.strobe_signals_truth_table)],
+                                                  self._generate_truth_table_line,
+                                                  2 ** len(self.address_signals))
 
 
 class DeviceMuxStrict(DeviceMux):
     """Strict multiplexer device"""
-    def _generate_function_in_cycle(self, address_line, i):
-        return self.address_and_data_function
+    constraints = dict(DeviceMux.constraints, address_signals={'min': 1, 'max': 5}, data_signals={'min': 1, 'max': 32})
+    architectures = ('sop',)
+    default_architecture_max_width = None
 
-    def _generate_function_after_cycle(self, address_and_data_minterms, address_and_data_exludes):
-        return SOPform(self.address_signals + self.data_signals,
-                       address_and_data_minterms, dontcares=address_and_data_exludes)
+    def _generate_function_in_cycle(self, address_and_data_function, address_line, i):
+        return address_and_data_function
+
+    def _generate_function_after_cycle(self, address_and_data_function, address_and_data_minterms,
+                                       address_and_data_exludes):
+        return minimize_sop(self.address_signals + self.data_signals,
+                            address_and_data_minterms, dontcares=address_and_data_exludes)
 
 
 class DeviceDemux(Device):
@@ -100,7 +140,7 @@ class DeviceDemux(Device):
         },
         'address_signals': {
             'min': 1,
-            'max': 5
+            'max': 10
         },
         'data_signals': {
             'min': 1,
@@ -108,30 +148,56 @@ class DeviceDemux(Device):
         },
         'output_signals': {
             'min': 1,
-            'max': 32
+            'max': 1024
         }
     }
-
-    def __init__(self, **kwargs):
-        super(DeviceDemux, self).__init__(**kwargs)
-        address_and_data_minterms = list()
-        address_and_data_exludes = list()
-        self.truth_table = list()
-        self.functions = list()
-        for i in range(0, 2 ** len(self.address_signals)):
-            address_line = list()
-            for address_line_value in generate_binary_lines_current(len(self.address_signals), i):
-                address_line.append(address_line_value)
-            address_line.reverse()
-            data_line = len(self.output_signals) * [0]
-            if i < len(data_line):
-                data_line[i] = 1
-                y_line = self.data_signals_truth_table
-                address_and_data_minterms.append(address_line + data_line)
-            else:
-                address_and_data_exludes.append(address_line + data_line)
-                y_line = map(lambda _y: 1 - _y, self.data_signals_truth_table)
-            self.truth_table.append((self.strobe_signals_truth_table, address_line, y_line, data_line))
-            if y_line[0] != 0:
-                address_and_data_function = SOPform(self.address_signals + self.data_signals, [address_line + y_line])
-                self.functions.append(self.strobe_signals_function & address_and_data_function)
+    functions_options = ('architecture',)
+    # Sum of products for each output ('sop') or decoder with predecoders of address halves ('predecoder'),
+    # may be overridden by architecture keyword argument. Devices with more than 5 address signals are decoders
+    # with predecoders by default
+    architectures = ('sop', 'predecoder')
+    default_architecture = 'sop'
+    default_architecture_max_width = 5
+    default_wide_architecture = 'predecoder'
+
+    def _get_width(self):
+        return len(self.address_signals)
+
+    def _generate_truth_table_line(self, i):
+        address_line = list()
+        for address_line_value in generate_binary_lines_current(len(self.address_signals), i):
+            address_line.append(address_line_value)
+        address_line.reverse()
+        data_line = len(self.output_signals) * [0]
+        if i < len(data_line):
+            data_line[i] = 1
+            y_line = list(self.data_signals_truth_table)
+        else:
+            y_line = map(lambda _y: 1 - _y, self.data_signals_truth_table)
+        return address_line, y_line, data_line
+
+    def _generate_netlist(self):
+        if self._get_architecture() != 'predecoder':
+            return None
+        # Output of address is active if data signals match their substitutions (data_signals_function)
+        enable_functions = [self.strobe_signals_function, self.data_signals_function]
+        return generate_decoder_netlist(self.address_signals, len(self.output_signals), enable_functions,
+                                        self._get_input_names())
+
+    def _generate_functions(self):
+        architecture = self._get_architecture()
+        if architecture not in self.architectures:
+            raise ArchitectureNotSupported(architecture)
+        if architecture == 'predecoder':
+            return self._get_functions_of_netlist()
+        functions = list()
+        for i in range(0, min(2 ** len(self.address_signals), len(self.output_signals))):
+            address_line, y_line, _ = self._generate_truth_table_line(i)
+            address_and_data_function = minimize_sop(self.address_signals + self.data_signals, [address_line + y_line])
+            functions.append(self.strobe_signals_function & address_and_data_function)
+        return functions
+
+    def _generate_truth_table(self):
+        return self._generate_truth_table_by_rows([list(self.strobe_signals_truth_table)],
+                                                  self._generate_truth_table_line,
+                                                  2 ** len(self.address_signals))
@@ -5,7 +5,6 @@ __author__ = 'Sergey Sobko'
 __email__ = 'S.Sobko@profitware.ru'
 __copyright__ = 'Copyright 2013, The Profitware Group'
 
-from sympy import symbols
 from sympy.logic import *
 
 from circuitry.exceptions import LogicFunctionNotSpecified
@@ -27,14 +26,9 @@ class DeviceSimple(Device):
         }
     }
 
-    def __init__(self, **kwargs):
-        super(DeviceSimple, self).__init__(**kwargs)
-        self._generate_through_truth_table(signals_list=(self.data_signals,))
-
-    @property
-    def functions(self):
+    def _generate_functions(self):
         if not self.logic_function:
-            return self.data_signals
+            return list(self.data_signals)
         return [self.logic_function(*self.data_signals)]
 
 
@@ -52,8 +46,7 @@ class DeviceNot(DeviceSimple):
         }
     }
 
-    @property
-    def functions(self):
+    def _generate_functions(self):
         return [self.logic_function(signal) for signal in self.data_signals]
 
 
@@ -86,7 +79,8 @@ class DeviceOr(DeviceSimple):
         }
     }
 
-def create_simple_device_by_function(device_function, is_topmost=False, save_signal_names=False):
+def create_simple_device_by_netlist_node(netlist, node, is_topmost=False):
+    """Simple device of netlist gate and its type ('input', 'output' or 'common')"""
     DeviceClass, _device = None, None
     device_class_dict = {
         'and': DeviceAnd,
@@ -96,21 +90,13 @@ def create_simple_device_by_function(device_function, is_topmost=False, save_sig
     device_type = 'common'
     if is_topmost:
         device_type = 'output'
-    _method = str(device_function.func).lower()
+    _method = netlist.operations[node]
     if _method in device_class_dict:
         DeviceClass = device_class_dict[_method]
         if _method == 'not':
-            if len(device_function.args) == 1 and device_function.args[0].is_Atom:
+            if netlist.operations[netlist.operands[node][0]] == 'input':
                 device_type = 'input'
-        if save_signal_names:
-            _signal_names = ','.join(map(str, device_function.args))
-        else:
-            _signal_names = 'd:%s' % len(device_function.args)
-        _device = DeviceClass(data_signals=_signal_names,
+        _device = DeviceClass(data_signals='d:%s' % len(netlist.operands[node]),
                               output_signals='y:1', output_signals_subs=dict(y0=1))
     return device_type, _device
 
-
-def create_simple_device_by_func_and_number_of_inputs(device_function_token, number_of_inputs, dnum):
-    rnd_pins = [symbols('random%s' % (num + number_of_inputs * dnum)) for num in range(0, number_of_inputs)]
-    return create_simple_device_by_function(device_function_token(*rnd_pins), save_signal_names=True)
@@ -47,4 +47,60 @@ class SignalsSubsMismatch(CircuitException):
         self.signals = signals
 
     def __str__(self):
-        return repr(self.signals)
\ No newline at end of file
+        return repr(self.signals)
+
+
+class EvaluationBackendNotSupported(CircuitException):
+    def __init__(self, backend):
+        self.backend = backend
+
+    def __str__(self):
+        return repr(self.backend)
+
+
+class DeviceFrozen(CircuitException):
+    def __init__(self, key):
+        self.key = key
+
+    def __str__(self):
+        return repr(self.key)
+
+
+class ArchitectureNotSupported(CircuitException):
+    def __init__(self, architecture):
+        self.architecture = architecture
+
+    def __str__(self):
+        return repr(self.architecture)
+
+
+class ReferenceModelNotSpecified(CircuitException):
+    def __init__(self, device_class):
+        self.device_class = device_class
+
+    def __str__(self):
+        return repr(self.device_class)
+
+
+class EquivalenceEngineNotSupported(CircuitException):
+    def __init__(self, engine):
+        self.engine = engine
+
+    def __str__(self):
+        return repr(self.engine)
+
+
+class OptimizationPassNotSupported(CircuitException):
+    def __init__(self, optimization_pass):
+        self.optimization_pass = optimization_pass
+
+    def __str__(self):
+        return repr(self.optimization_pass)
+
+
+class MaxFanInNotSupported(CircuitException):
+    def __init__(self, max_fan_in):
+        self.max_fan_in = max_fan_in
+
+    def __str__(self):
+        return repr(self.max_fan_in)
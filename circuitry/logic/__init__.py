@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+
+def get_function_name(function):
+    """Name of logic function class (And, Or, Not, ...) or None for atoms"""
+    if isinstance(function, (bool, int, long)) or not function.args:
+        return None
+    return str(function.func)
+
+
+def get_constant_value(function):
+    """Boolean value of constant atom or None for symbols and functions"""
+    if isinstance(function, (bool, int, long)):
+        return bool(function)
+    if function.is_Symbol or function.args:
+        return None
+    return bool(function)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from sympy import Symbol
+from sympy.logic import And, Or, Not
+
+from circuitry.exceptions import SignalsNotSpecified
+from circuitry.logic.netlist import Netlist
+
+
+class BDD(object):
+    """Reduced ordered binary decision diagrams with one hash-consed node table and fixed order of variables.
+
+    Nodes are numbers, 0 and 1 are terminal nodes. Equal functions are always represented by equal nodes.
+    """
+    false = 0
+    true = 1
+
+    def __init__(self, variables=None):
+        self.variables = list()
+        self.outputs = list()
+        self._levels = dict()
+        # Level (number of variable), low (variable is 0) and high (variable is 1) successors of each node
+        self._level = [None, None]
+        self._low = [0, 1]
+        self._high = [0, 1]
+        self._nodes = dict()
+        self._ite_cache = dict()
+        for variable in variables or ():
+            self.add_variable(variable)
+
+    @classmethod
+    def from_netlist(cls, netlist, variables=None):
+        """BDD for netlist outputs, netlist inputs not present in variables are added after them"""
+        bdd = cls(variables)
+        for node in netlist.inputs:
+            bdd.add_variable(netlist.values[node])
+        bdd.outputs = bdd.add_netlist(netlist)
+        return bdd
+
+    @classmethod
+    def from_functions(cls, functions, variables=None):
+        """BDD for sympy logic functions, order of variables is given by variables list"""
+        variable_names = [str(variable) for variable in variables or ()]
+        return cls.from_netlist(Netlist.from_functions(functions, variable_names), variable_names)
+
+    def __len__(self):
+        return len(self._level)
+
+    def add_variable(self, name):
+        name = str(name)
+        if name not in self._levels:
+            self._levels[name] = len(self.variables)
+            self.variables.append(name)
+        return self._levels[name]
+
+    def _get_level(self, node):
+        level = self._level[node]
+        return len(self.variables) if level is None else level
+
+    def make_node(self, level, low, high):
+        if low == high:
+            return low
+        node_key = (level, low, high)
+        if node_key not in self._nodes:
+            self._level.append(level)
+            self._low.append(low)
+            self._high.append(high)
+            self._nodes[node_key] = len(self._level) - 1
+        return self._nodes[node_key]
+
+    def variable(self, name):
+        return self.make_node(self.add_variable(name), self.false, self.true)
+
+    def _cofactors(self, node, level):
+        if self._get_level(node) != level:
+            return node, node
+        return self._low[node], self._high[node]
+
+    def ite(self, f, g, h):
+        """If-then-else: f and g or not f and h"""
+        if f == self.true:
+            return g
+        if f == self.false:
+            return h
+        if g == h:
+            return g
+        if g == self.true and h == self.false:
+            return f
+        cache_key = (f, g, h)
+        if cache_key in self._ite_cache:
+            return self._ite_cache[cache_key]
+        level = min(self._get_level(f), self._get_level(g), self._get_level(h))
+        f_low, f_high = self._cofactors(f, level)
+        g_low, g_high = self._cofactors(g, level)
+        h_low, h_high = self._cofactors(h, level)
+        node = self.make_node(level, self.ite(f_low, g_low, h_low), self.ite(f_high, g_high, h_high))
+        self._ite_cache[cache_key] = node
+        return node
+
+    def negate(self, f):
+        return self.ite(f, self.false, self.true)
+
+    def conjunction(self, *nodes):
+        result = self.true
+        for node in nodes:
+            result = self.ite(result, node, self.false)
+        return result
+
+    def disjunction(self, *nodes):
+        result = self.false
+        for node in nodes:
+            result = self.ite(result, self.true, node)
+        return result
+
+    def exclusive_disjunction(self, *nodes):
+        result = self.false
+        for node in nodes:
+            result = self.ite(result, self.negate(node), node)
+        return result
+
+    def add_netlist(self, netlist):
+        """Nodes for netlist outputs"""
+        nodes = dict()
+        for netlist_node in netlist.reachable_nodes():
+            operation = netlist.operations[netlist_node]
+            operands = [nodes[operand] for operand in netlist.operands[netlist_node]]
+            if operation == 'input':
+                nodes[netlist_node] = self.variable(netlist.values[netlist_node])
+            elif operation == 'constant':
+                nodes[netlist_node] = self.true if netlist.values[netlist_node] else self.false
+            elif operation == 'not':
+                nodes[netlist_node] = self.negate(operands[0])
+            elif operation == 'and':
+                nodes[netlist_node] = self.conjunction(*operands)
+            elif operation == 'or':
+                nodes[netlist_node] = self.disjunction(*operands)
+            else:
+                nodes[netlist_node] = self.exclusive_disjunction(*operands)
+        return [nodes[netlist_node] for netlist_node in netlist.outputs]
+
+    def add_function(self, function):
+        netlist = Netlist.from_functions([function], self.variables)
+        for node in netlist.inputs:
+            self.add_variable(netlist.values[node])
+        return self.add_netlist(netlist)[0]
+
+    def restrict(self, node, values):
+        """Cofactor of node by values of some variables given as dict name -> 0 or 1"""
+        levels_values = dict([(self._levels[str(name)], value) for name, value in values.iteritems()
+                              if str(name) in self._levels])
+        restricted = dict()
+
+        def _restrict(_node):
+            if _node in (self.false, self.true):
+                return _node
+            if _node not in restricted:
+                level = self._level[_node]
+                if level in levels_values:
+                    restricted[_node] = _restrict(self._high[_node] if levels_values[level] else self._low[_node])
+                else:
+                    restricted[_node] = self.make_node(level, _restrict(self._low[_node]),
+                                                       _restrict(self._high[_node]))
+            return restricted[_node]
+        return _restrict(node)
+
+    def evaluate(self, node, values):
+        """Value of node for values of variables given as dict name -> 0 or 1"""
+        while node not in (self.false, self.true):
+            variable = self.variables[self._level[node]]
+            if variable not in values:
+                raise SignalsNotSpecified((variable,))
+            node = self._high[node] if values[variable] else self._low[node]
+        return node
+
+    def count_solutions(self, node):
+        """Number of assignments of all variables for which node is true"""
+        if node == self.false:
+            return 0
+        counts = dict()
+
+        def _count(_node):
+            # Assignments of variables from level of node to the last one
+            if _node in (self.false, self.true):
+                return _node
+            if _node not in counts:
+                level = self._level[_node]
+                counts[_node] = sum([_count(successor) * 2 ** (self._get_level(successor) - level - 1)
+                                     for successor in (self._low[_node], self._high[_node])])
+            return counts[_node]
+        return _count(node) * 2 ** self._get_level(node)
+
+    def satisfy_one(self, node):
+        """Values of variables (dict name -> 0 or 1) for which node is true or None"""
+        if node == self.false:
+            return None
+        values = dict()
+        while node != self.true:
+            variable = self.variables[self._level[node]]
+            if self._high[node] != self.false:
+                values[variable], node = 1, self._high[node]
+            else:
+                values[variable], node = 0, self._low[node]
+        return values
+
+    def size(self, node):
+        """Number of nonterminal nodes reachable from node"""
+        visited = set()
+        stack = [node]
+        while stack:
+            _node = stack.pop()
+            if _node in (self.false, self.true) or _node in visited:
+                continue
+            visited.add(_node)
+            stack.extend([self._low[_node], self._high[_node]])
+        return len(visited)
+
+    def canonical_form(self, node):
+        """Hashable form of function which does not depend on the other functions in node table"""
+        numbers = {self.false: 0, self.true: 1}
+        form = list()
+
+        def _walk(_node):
+            if _node not in numbers:
+                low, high = _walk(self._low[_node]), _walk(self._high[_node])
+                form.append((self.variables[self._level[_node]], low, high))
+                numbers[_node] = len(form) + 1
+            return numbers[_node]
+        _walk(node)
+        return tuple(form)
+
+    def to_function(self, node):
+        """Sympy logic function of node"""
+        functions = {self.false: False, self.true: True}
+
+        def _convert(_node):
+            if _node not in functions:
+                variable = Symbol(self.variables[self._level[_node]])
+                low, high = _convert(self._low[_node]), _convert(self._high[_node])
+                if high is True and low is False:
+                    functions[_node] = variable
+                elif high is False and low is True:
+                    functions[_node] = Not(variable)
+                elif low is False:
+                    functions[_node] = And(variable, high)
+                elif high is False:
+                    functions[_node] = And(Not(variable), low)
+                elif high is True:
+                    functions[_node] = Or(variable, low)
+                elif low is True:
+                    functions[_node] = Or(Not(variable), high)
+                else:
+                    functions[_node] = Or(And(variable, high), And(Not(variable), low))
+            return functions[_node]
+        return _convert(node)
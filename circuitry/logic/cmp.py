@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from circuitry.logic.netlist import Netlist
+
+
+def _combine_comparisons(netlist, high, low):
+    # Comparisons (lt, eq, gt) of more significant and less significant parts of words
+    high_lt, high_eq, high_gt = high
+    low_lt, low_eq, low_gt = low
+    return (netlist.add_gate('or', (high_lt, netlist.add_gate('and', (high_eq, low_lt)))),
+            netlist.add_gate('and', (high_eq, low_eq)),
+            netlist.add_gate('or', (high_gt, netlist.add_gate('and', (high_eq, low_gt)))))
+
+
+def _add_tree(netlist, items, combine):
+    """Combine adjacent items pairwise until one is left, items are ordered from the most significant one"""
+    while len(items) > 1:
+        items = [combine(netlist, items[i], items[i + 1]) if i + 1 < len(items) else items[i]
+                 for i in xrange(0, len(items), 2)]
+    return items[0]
+
+
+def generate_comparator_netlist(first_signals, second_signals, enable_functions=(), input_names=None,
+                                equality_only=False):
+    """Netlist of comparator built as balanced tree of cells combining (lt, eq, gt) of adjacent parts of words.
+
+    Bits with larger index are more significant, words are compared by their common bits. Outputs are lt, eq and gt
+    (only eq if equality_only) and-ed with enable functions. Tree has logarithmic depth and linear size.
+    Inputs of netlist are input_names (in their order) if given.
+    """
+    netlist = Netlist(input_names or [str(signal) for signal in list(first_signals) + list(second_signals)])
+    width = min(len(first_signals), len(second_signals))
+    cells = list()
+    for i in xrange(width - 1, -1, -1):
+        first, second = netlist.add_input(first_signals[i]), netlist.add_input(second_signals[i])
+        equal = netlist.add_gate('not', (netlist.add_gate('xor', (first, second)),))
+        if equality_only:
+            cells.append(equal)
+        else:
+            cells.append((netlist.add_gate('and', (netlist.add_gate('not', (first,)), second)), equal,
+                          netlist.add_gate('and', (first, netlist.add_gate('not', (second,))))))
+    if equality_only:
+        outputs = [_add_tree(netlist, cells, lambda _netlist, high, low: _netlist.add_gate('and', (high, low)))
+                   if cells else netlist.add_constant(True)]
+    elif cells:
+        outputs = list(_add_tree(netlist, cells, _combine_comparisons))
+    else:
+        outputs = [netlist.add_constant(False), netlist.add_constant(True), netlist.add_constant(False)]
+    enable_nodes = [netlist.add_function(function) for function in enable_functions]
+    netlist.outputs = [netlist.add_gate('and', enable_nodes + [output]) if enable_nodes else output
+                       for output in outputs]
+    return netlist
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from circuitry.logic.netlist import Netlist
+
+
+_OPERATION_TEMPLATES = {
+    'and': ' & ',
+    'or': ' | ',
+    'xor': ' ^ '
+}
+
+
+def generate_gate_statements(netlist, node, names, mask='mask'):
+    """Python assignments computing value of gate node to names[node] from values of its operands"""
+    operation = netlist.operations[node]
+    if operation == 'constant':
+        return ['%s = %s' % (names[node], netlist.values[node] and mask or '0')]
+    if operation == 'not':
+        return ['%s = %s ^ %s' % (names[node], names[netlist.operands[node][0]], mask)]
+    # Wide gates are split to keep expressions short
+    operands = [names[operand] for operand in netlist.operands[node]]
+    statements = ['%s = %s' % (names[node], _OPERATION_TEMPLATES[operation].join(operands[:32]))]
+    for operands_start in xrange(32, len(operands), 32):
+        statements.append('%s = %s' % (names[node], _OPERATION_TEMPLATES[operation].join(
+            [names[node]] + operands[operands_start:operands_start + 32])))
+    return statements
+
+
+def generate_netlist_source(netlist, function_name='evaluate'):
+    """Python source of straight-line function evaluate(mask, inputs) returning tuple of outputs.
+
+    Values are bit-parallel: every bit of integer (or element of boolean array) is separate input vector,
+    mask has all used bits set.
+    """
+    names = dict()
+    for input_number, node in enumerate(netlist.inputs):
+        names[node] = 'i%d' % input_number
+    source_lines = ['def %s(mask, inputs):' % function_name]
+    if netlist.inputs:
+        source_lines.append('    %s, = inputs' % ', '.join([names[node] for node in netlist.inputs]))
+    for node in netlist.reachable_nodes():
+        if netlist.operations[node] == 'input':
+            continue
+        names[node] = 'n%d' % node
+        source_lines.extend(['    %s' % statement for statement in generate_gate_statements(netlist, node, names)])
+    source_lines.append('    return (%s)' % ''.join(['%s, ' % names[node] for node in netlist.outputs]))
+    return '\n'.join(source_lines) + '\n'
+
+
+def compile_source(source, function_name='evaluate'):
+    namespace = dict()
+    exec(compile(source, '<circuitry netlist>', 'exec'), namespace)
+    return namespace[function_name]
+
+
+def compile_netlist(netlist):
+    """Compile netlist to Python function, see generate_netlist_source"""
+    return compile_source(generate_netlist_source(netlist))
+
+
+def compile_functions(functions, input_names=None):
+    """Compile sympy logic functions to one Python function with common subexpressions evaluated once"""
+    return compile_netlist(Netlist.from_functions(functions, input_names))
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+import numpy
+
+from circuitry.exceptions import EquivalenceEngineNotSupported
+from circuitry.logic.bdd import BDD
+from circuitry.logic.compiler import compile_netlist
+from circuitry.logic.netlist import Netlist
+from circuitry.logic.numeric import unpack_columns
+from circuitry.logic.sat import CDCLSolver
+
+
+equivalence_engines = ('sat', 'bdd')
+
+
+def add_netlist(netlist, other_netlist, inputs_map=None):
+    """Add nodes of other netlist used by its outputs to netlist, inputs are matched by names (renamed by inputs_map).
+
+    Returns nodes of netlist for outputs of other netlist, equal gates are added once.
+    """
+    inputs_map = inputs_map or dict()
+    nodes = dict()
+    for node in other_netlist.reachable_nodes():
+        operation = other_netlist.operations[node]
+        if operation == 'input':
+            name = other_netlist.values[node]
+            nodes[node] = netlist.add_input(inputs_map.get(name, name))
+        elif operation == 'constant':
+            nodes[node] = netlist.add_constant(other_netlist.values[node])
+        else:
+            nodes[node] = netlist.add_gate(operation, [nodes[operand] for operand in other_netlist.operands[node]])
+    return [nodes[node] for node in other_netlist.outputs]
+
+
+def build_miter(first_netlist, second_netlist, outputs_count=None, inputs_map=None):
+    """Netlist with the only output true for inputs some of outputs of netlists differ for.
+
+    Outputs structurally equal in both netlists are not compared. Inputs of second netlist are renamed by inputs_map.
+    """
+    miter = Netlist()
+    first_outputs = add_netlist(miter, first_netlist)
+    second_outputs = add_netlist(miter, second_netlist, inputs_map)
+    if outputs_count is None:
+        outputs_count = min(len(first_outputs), len(second_outputs))
+    differences = [miter.add_gate('xor', (first_output, second_output))
+                   for first_output, second_output in zip(first_outputs[:outputs_count], second_outputs[:outputs_count])
+                   if first_output != second_output]
+    if not differences:
+        miter.outputs = [miter.add_constant(False)]
+    elif len(differences) == 1:
+        miter.outputs = differences
+    else:
+        miter.outputs = [miter.add_gate('or', differences)]
+    return miter
+
+
+def _get_variables_order(netlist):
+    """Inputs in order they are reached by depth-first walk from outputs, it keeps related inputs close"""
+    order = list()
+    visited = set()
+    for output in netlist.outputs:
+        stack = [output]
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            if netlist.operations[node] == 'input':
+                order.append(netlist.values[node])
+            stack.extend(reversed(netlist.operands[node]))
+    return order
+
+
+def _simulate_miter(miter, vectors_count, seed):
+    """Values of inputs for random vector miter output is true for or None"""
+    words_count = (vectors_count + 63) // 64
+    random_state = numpy.random.RandomState(seed)
+    inputs = [random_state.randint(0, 2 ** 16, size=(words_count, 4)).astype(numpy.uint16).view(numpy.uint64)[:, 0]
+              for _ in miter.inputs]
+    output = numpy.zeros(words_count, dtype=numpy.uint64) | compile_netlist(miter)(numpy.uint64(2 ** 64 - 1),
+                                                                                  inputs)[0]
+    if not output.any():
+        return None
+    word = numpy.flatnonzero(output)[0]
+    bit = numpy.flatnonzero(unpack_columns(output[word:word + 1].reshape(1, 1), 64)[0])[0]
+    return dict([(miter.values[node], int(unpack_columns(words[word:word + 1].reshape(1, 1), 64)[0][bit]))
+                 for node, words in zip(miter.inputs, inputs)])
+
+
+def _solve_miter_by_sat(miter):
+    """Tseitin encoding of miter, returns values of inputs satisfying it or None"""
+    solver = CDCLSolver()
+    literals = dict()
+    for node in miter.reachable_nodes():
+        operation = miter.operations[node]
+        operands = [literals[operand] for operand in miter.operands[node]]
+        if operation == 'not':
+            literals[node] = -operands[0]
+            continue
+        literals[node] = literal = solver.new_variable()
+        if operation == 'constant':
+            solver.add_clause([literal if miter.values[node] else -literal])
+        elif operation == 'and':
+            for operand in operands:
+                solver.add_clause([-literal, operand])
+            solver.add_clause([literal] + [-operand for operand in operands])
+        elif operation == 'or':
+            for operand in operands:
+                solver.add_clause([literal, -operand])
+            solver.add_clause([-literal] + operands)
+        elif operation == 'xor':
+            # Chain of two-input exclusive disjunctions
+            value = operands[0]
+            for i, operand in enumerate(operands[1:]):
+                result = literal if i == len(operands) - 2 else solver.new_variable()
+                solver.add_clause([-result, value, operand])
+                solver.add_clause([-result, -value, -operand])
+                solver.add_clause([result, -value, operand])
+                solver.add_clause([result, value, -operand])
+                value = result
+            if len(operands) == 1:
+                solver.add_clause([-literal, value])
+                solver.add_clause([literal, -value])
+    solver.add_clause([literals[miter.outputs[0]]])
+    model = solver.solve()
+    if model is None:
+        return None
+    return dict([(miter.values[node], int(model.get(literals[node], False))) for node in miter.inputs])
+
+
+def _solve_miter_by_bdd(miter):
+    bdd = BDD.from_netlist(miter, _get_variables_order(miter))
+    values = bdd.satisfy_one(bdd.outputs[0])
+    if values is None:
+        return None
+    return dict([(miter.values[node], values.get(miter.values[node], 0)) for node in miter.inputs])
+
+
+def check_equivalence(first_netlist, second_netlist, engine='sat', outputs_count=None, inputs_map=None,
+                      vectors_count=1024, seed=None):
+    """Check that outputs of netlists (all of them or the first outputs_count) are equal for all values of inputs.
+
+    Inputs of both netlists are matched by names, inputs of second one are renamed by inputs_map. Miter of netlists
+    is simulated on random vectors first, then it is decided by SAT solver ('sat') or binary decision diagram ('bdd').
+    Returns whether netlists are equivalent and values of inputs (counterexample) they differ for. Netlists with
+    different numbers of compared outputs are not equivalent, counterexample is None for them.
+    """
+    if engine not in equivalence_engines:
+        raise EquivalenceEngineNotSupported(engine)
+    first_outputs_count, second_outputs_count = len(first_netlist.outputs), len(second_netlist.outputs)
+    if outputs_count is not None:
+        first_outputs_count, second_outputs_count = [min(outputs_count, count)
+                                                     for count in (first_outputs_count, second_outputs_count)]
+    if first_outputs_count != second_outputs_count:
+        return {
+            'equivalent': False,
+            'counterexample': None,
+            'engine': engine,
+            'miter_gates': 0
+        }
+    miter = build_miter(first_netlist, second_netlist, first_outputs_count, inputs_map)
+    counterexample = None
+    # Miter is constant false if all outputs are structurally equal
+    if miter.operations[miter.outputs[0]] != 'constant':
+        counterexample = _simulate_miter(miter, vectors_count, seed) if vectors_count else None
+        if counterexample is None:
+            counterexample = (_solve_miter_by_sat if engine == 'sat' else _solve_miter_by_bdd)(miter)
+    return {
+        'equivalent': counterexample is None,
+        'counterexample': counterexample,
+        'engine': engine,
+        'miter_gates': miter.count_gates()
+    }
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from multiprocessing import Pool
+
+import numpy
+
+from circuitry.logic.numeric import pack_columns, unpack_columns
+
+
+_MASK = numpy.uint64(2 ** 64 - 1)
+
+_worker_arguments = None
+
+
+def _evaluate_gate(operation, operand_values):
+    value = operand_values[0]
+    if operation == 'and':
+        for operand_value in operand_values[1:]:
+            value = value & operand_value
+    elif operation == 'or':
+        for operand_value in operand_values[1:]:
+            value = value | operand_value
+    elif operation == 'xor':
+        for operand_value in operand_values[1:]:
+            value = value ^ operand_value
+    else:
+        value = value ^ _MASK
+    return value
+
+
+def get_fault_name(netlist, fault):
+    """Name of net (signal name for inputs) and stuck value of fault, e.g. ('a0', 1)"""
+    node, value = fault
+    if netlist.operations[node] == 'input':
+        return netlist.values[node], value
+    return 'node%d' % node, value
+
+
+def generate_faults(netlist):
+    """Single stuck-at-0 and stuck-at-1 faults (node, value) of all inputs and gates used by outputs"""
+    return [(node, value) for node in netlist.reachable_nodes() if netlist.operations[node] != 'constant'
+            for value in (0, 1)]
+
+
+def _simulate_faults_shard(netlist, input_words, rows_count, faults, chunk_words):
+    nodes = netlist.reachable_nodes()
+    fanouts = dict([(node, list()) for node in nodes])
+    for node in nodes:
+        for operand in netlist.operands[node]:
+            fanouts[operand].append(node)
+    # Nodes fault may change, in topological order
+    cones = dict()
+    for node, _ in faults:
+        if node not in cones:
+            cone = set()
+            stack = list(fanouts[node])
+            while stack:
+                cone_node = stack.pop()
+                if cone_node not in cone:
+                    cone.add(cone_node)
+                    stack.extend(fanouts[cone_node])
+            cones[node] = sorted(cone)
+    valid_words = pack_columns([numpy.ones(rows_count, dtype=numpy.bool_)])[0]
+    detections = dict()
+    remaining_faults = list(faults)
+    for start in xrange(0, len(valid_words), chunk_words):
+        if not remaining_faults:
+            break
+        valid = valid_words[start:start + chunk_words]
+        values = [None] * len(netlist)
+        for node, words in zip(netlist.inputs, input_words):
+            values[node] = words[start:start + chunk_words] if numpy.ndim(words) else words
+        for node in nodes:
+            if netlist.operations[node] == 'constant':
+                values[node] = _MASK if netlist.values[node] else numpy.uint64(0)
+            elif netlist.operations[node] != 'input':
+                values[node] = _evaluate_gate(netlist.operations[node],
+                                              [values[operand] for operand in netlist.operands[node]])
+        undetected_faults = list()
+        for fault in remaining_faults:
+            node, value = fault
+            stuck_words = _MASK if value else numpy.uint64(0)
+            # Faults not activated by vectors of chunk are not propagated
+            if not numpy.any((values[node] ^ stuck_words) & valid):
+                undetected_faults.append(fault)
+                continue
+            faulty_values = list(values)
+            faulty_values[node] = stuck_words
+            for cone_node in cones[node]:
+                faulty_values[cone_node] = _evaluate_gate(netlist.operations[cone_node],
+                                                          [faulty_values[operand]
+                                                           for operand in netlist.operands[cone_node]])
+            differences = numpy.zeros(len(valid), dtype=numpy.uint64)
+            for output in netlist.outputs:
+                differences |= values[output] ^ faulty_values[output]
+            differences &= valid
+            if differences.any():
+                word = numpy.flatnonzero(differences)[0]
+                bit = numpy.flatnonzero(unpack_columns(differences[word:word + 1].reshape(1, 1), 64)[0])[0]
+                detections[fault] = (start + word) * 64 + bit
+            else:
+                undetected_faults.append(fault)
+        remaining_faults = undetected_faults
+    return detections
+
+
+def _initialize_worker(netlist, input_words, rows_count, chunk_words):
+    global _worker_arguments
+    _worker_arguments = (netlist, input_words, rows_count, chunk_words)
+
+
+def _simulate_worker_faults(faults):
+    netlist, input_words, rows_count, chunk_words = _worker_arguments
+    return _simulate_faults_shard(netlist, input_words, rows_count, faults, chunk_words)
+
+
+def simulate_faults(netlist, input_words, rows_count, faults=None, workers=1, chunk_words=1024):
+    """Parallel-pattern simulation of stuck-at faults (all of netlist by default).
+
+    Input words are packed by pack_columns for each input of netlist (or single words for constant inputs), each
+    fault is simulated over its fanout cone for chunks of chunk_words words and dropped once detected. Faults are
+    split between worker processes, vectors are passed to workers once. Returns dict of detected faults and numbers
+    of the first vectors detecting them.
+    """
+    if faults is None:
+        faults = generate_faults(netlist)
+    if workers <= 1 or len(faults) < 2 * workers:
+        return _simulate_faults_shard(netlist, input_words, rows_count, faults, chunk_words)
+    shards = [faults[i::workers] for i in xrange(0, workers)]
+    pool = Pool(processes=workers, initializer=_initialize_worker,
+                initargs=(netlist, input_words, rows_count, chunk_words))
+    try:
+        shards_detections = pool.map(_simulate_worker_faults, shards)
+    finally:
+        pool.close()
+        pool.join()
+    detections = dict()
+    for shard_detections in shards_detections:
+        detections.update(shard_detections)
+    return detections
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from heapq import heapify, heappush, heappop
+
+from circuitry.exceptions import MaxFanInNotSupported
+from circuitry.logic.netlist import Netlist
+
+
+def _add_gates_tree(netlist, operation, operands, depths, max_fan_in):
+    """Gate of many operands as tree of gates of at most max_fan_in operands with the least depth.
+
+    Shallowest operands are combined first (like in Huffman coding), the first gate takes just enough operands
+    for all the others to be full, so number of gates is the least too.
+    """
+    heap = [(depths[operand], i, operand) for i, operand in enumerate(operands)]
+    heapify(heap)
+    group_size = (len(heap) - 2) % (max_fan_in - 1) + 2
+    while len(heap) > 1:
+        group = [heappop(heap) for _ in xrange(0, min(group_size, len(heap)))]
+        # Operands keep their order in each gate
+        group.sort(key=lambda item: item[1])
+        node = netlist.add_gate(operation, [operand for _, _, operand in group])
+        depths[node] = max([depth for depth, _, _ in group]) + 1
+        heappush(heap, (depths[node], min([i for _, i, _ in group]), node))
+        group_size = max_fan_in
+    return heap[0][2]
+
+
+def map_fan_in(netlist, max_fan_in):
+    """Netlist with gates wider than max_fan_in[operation] (e.g. {'and': 4, 'or': 4}) split to balanced trees.
+
+    Returns mapped netlist and report of gate count and logic depth before and after mapping.
+    """
+    # Gates can not be split to gates of less than 2 operands
+    for operation, operation_max_fan_in in max_fan_in.iteritems():
+        if operation_max_fan_in < 2:
+            raise MaxFanInNotSupported({operation: operation_max_fan_in})
+    mapped_netlist = Netlist([netlist.values[node] for node in netlist.inputs])
+    mapped_nodes = dict()
+    depths = dict()
+    for node in netlist.reachable_nodes():
+        operation = netlist.operations[node]
+        operands = [mapped_nodes[operand] for operand in netlist.operands[node]]
+        if operation == 'input':
+            mapped_node = mapped_netlist.add_input(netlist.values[node])
+        elif operation == 'constant':
+            mapped_node = mapped_netlist.add_constant(netlist.values[node])
+        elif len(operands) > max_fan_in.get(operation, len(operands)):
+            mapped_node = _add_gates_tree(mapped_netlist, operation, operands, depths, max_fan_in[operation])
+        else:
+            mapped_node = mapped_netlist.add_gate(operation, operands)
+        if mapped_node not in depths:
+            depths[mapped_node] = max([depths[operand] + 1 for operand in operands] or [0])
+        mapped_nodes[node] = mapped_node
+    mapped_netlist.outputs = [mapped_nodes[node] for node in netlist.outputs]
+    report = {
+        'gates_before': netlist.count_gates(),
+        'depth_before': netlist.get_depth(),
+        'gates_after': mapped_netlist.count_gates(),
+        'depth_after': mapped_netlist.get_depth()
+    }
+    return mapped_netlist, report
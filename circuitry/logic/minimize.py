@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from sympy.logic import And, Or, Not
+
+
+# Functions of more variables or more prime implicants are minimized heuristically, exact cover is exponential
+exact_max_variables = 16
+exact_max_prime_implicants = 128
+
+
+def get_minterm_value(minterm, variables_count):
+    """Bitset of minterm given by list of bits or integer, bit i is value of variables[i]"""
+    if isinstance(minterm, (int, long)):
+        minterm = [(minterm >> (variables_count - 1 - i)) & 1 for i in range(0, variables_count)]
+    value = 0
+    for i in range(0, variables_count):
+        if minterm[i]:
+            value |= 1 << i
+    return value
+
+
+def generate_prime_implicants(cubes):
+    """Quine-McCluskey merging of cubes (value, care mask) into prime implicants"""
+    prime_implicants = set()
+    current_cubes = set(cubes)
+    while current_cubes:
+        cubes_by_mask = dict()
+        for value, mask in current_cubes:
+            cubes_by_mask.setdefault(mask, set()).add(value)
+        merged_cubes = set()
+        next_cubes = set()
+        for mask, values in cubes_by_mask.iteritems():
+            for value in values:
+                care_bits = mask
+                while care_bits:
+                    bit = care_bits & -care_bits
+                    care_bits ^= bit
+                    if value & bit and value ^ bit in values:
+                        next_cubes.add((value ^ bit, mask ^ bit))
+                        merged_cubes.add((value, mask))
+                        merged_cubes.add((value ^ bit, mask))
+        prime_implicants |= current_cubes - merged_cubes
+        current_cubes = next_cubes
+    return prime_implicants
+
+
+def _get_bits(bitset):
+    """Numbers of set bits of bitset"""
+    bits = list()
+    while bitset:
+        bit = bitset & -bitset
+        bits.append(bit.bit_length() - 1)
+        bitset ^= bit
+    return bits
+
+
+def _reduce_cover_table(cover, uncovered, available, cube_minterms, minterm_cubes, literals):
+    """Essential cubes are added to cover, dominated cubes and minterms are removed from covering table.
+
+    Minterms and cubes of covering table are bitsets, uncovered minterms and available cubes are returned,
+    None if some minterm can not be covered.
+    """
+    reduced = False
+    while not reduced:
+        reduced = True
+        # Only cube covering a minterm is essential
+        for i in _get_bits(uncovered):
+            cubes = minterm_cubes[i] & available
+            if not uncovered & (1 << i):
+                continue
+            if not cubes:
+                return None, None
+            if not cubes & (cubes - 1):
+                j = cubes.bit_length() - 1
+                cover.append(j)
+                uncovered &= ~cube_minterms[j]
+                available &= ~cubes
+                reduced = False
+        # Cube covering subset of minterms of another cube with not more literals is never needed
+        cubes = sorted(_get_bits(available), key=lambda _j: (-bin(cube_minterms[_j] & uncovered).count('1'),
+                                                             literals[_j], _j))
+        for n, j in enumerate(cubes):
+            minterms = cube_minterms[j] & uncovered
+            if not minterms or any([available & (1 << k) and not minterms & ~cube_minterms[k] and
+                                    literals[k] <= literals[j] for k in cubes[:n]]):
+                available &= ~(1 << j)
+                reduced = False
+        # Minterm covered by all cubes covering another minterm is covered anyway
+        minterms = sorted(_get_bits(uncovered), key=lambda _i: (-bin(minterm_cubes[_i] & available).count('1'), _i))
+        for n, i in enumerate(minterms):
+            if any([uncovered & (1 << k) and not minterm_cubes[k] & available & ~minterm_cubes[i]
+                    for k in minterms[n + 1:]]):
+                uncovered &= ~(1 << i)
+                reduced = False
+    return uncovered, available
+
+
+def _get_cover_lower_bound(uncovered, available, minterm_cubes):
+    """Number of uncovered minterms no two of which are covered by the same cube"""
+    lower_bound = 0
+    used_cubes = 0
+    for i in sorted(_get_bits(uncovered), key=lambda _i: (bin(minterm_cubes[_i] & available).count('1'), _i)):
+        if not minterm_cubes[i] & available & used_cubes:
+            lower_bound += 1
+            used_cubes |= minterm_cubes[i] & available
+    return lower_bound
+
+
+def select_cover(cubes, minterms):
+    """Exact minimum cover of minterms by cubes, branch and bound over reduced covering table.
+
+    Cover of the least number of cubes is selected, the least number of literals is the second criterion.
+    """
+    cubes = sorted(cubes)
+    minterms = sorted(minterms)
+    literals = [bin(mask).count('1') for _, mask in cubes]
+    cube_minterms = [sum([1 << i for i, minterm in enumerate(minterms) if minterm & mask == value])
+                     for value, mask in cubes]
+    minterm_cubes = [sum([1 << j for j, (value, mask) in enumerate(cubes) if minterm & mask == value])
+                     for minterm in minterms]
+    best = dict(cover=None, cost=None)
+
+    def select_cubes(cover, uncovered, available):
+        uncovered, available = _reduce_cover_table(cover, uncovered, available, cube_minterms, minterm_cubes, literals)
+        if uncovered is None:
+            return
+        cost = (len(cover), sum([literals[j] for j in cover]))
+        if not uncovered:
+            if best['cost'] is None or cost < best['cost']:
+                best['cover'], best['cost'] = cover, cost
+            return
+        # Each of minterms not covered by the same cube needs its own cube of at least the least number of literals
+        lower_bound = _get_cover_lower_bound(uncovered, available, minterm_cubes)
+        literals_lower_bound = lower_bound * min([literals[j] for j in _get_bits(available)])
+        if best['cost'] is not None and (cost[0] + lower_bound, cost[1] + literals_lower_bound) >= best['cost']:
+            return
+        # One of cubes covering minterm covered by the least number of cubes is in any cover, cubes of previous
+        # branches are excluded from the next ones
+        i = min(_get_bits(uncovered), key=lambda _i: (bin(minterm_cubes[_i] & available).count('1'), _i))
+        for j in sorted(_get_bits(minterm_cubes[i] & available),
+                        key=lambda _j: (-bin(cube_minterms[_j] & uncovered).count('1'), literals[_j], _j)):
+            select_cubes(cover + [j], uncovered & ~cube_minterms[j], available & ~(1 << j))
+            available &= ~(1 << j)
+
+    select_cubes(list(), (1 << len(minterms)) - 1, (1 << len(cubes)) - 1)
+    return [cubes[j] for j in best['cover']]
+
+
+def expand_cubes(minterms, dontcares, variables_count):
+    """Espresso-like expansion of minterms into prime cubes which do not intersect the off-set"""
+    care_set = set(minterms) | set(dontcares)
+    full_mask = (1 << variables_count) - 1
+    cover = list()
+    for minterm in sorted(minterms):
+        if any([minterm & mask == value for value, mask in cover]):
+            continue
+        value, mask = minterm, full_mask
+        for i in range(0, variables_count):
+            bit = 1 << i
+            raised_value, raised_mask = value & ~bit, mask & ~bit
+            # Cube of 2 ** k minterms is allowed if all of them are in on-set or don't-care set
+            free_count = variables_count - bin(raised_mask).count('1')
+            if len([_minterm for _minterm in care_set if _minterm & raised_mask == raised_value]) == 2 ** free_count:
+                value, mask = raised_value, raised_mask
+        cover.append((value, mask))
+    # Irredundant cover
+    for cube in list(cover):
+        other_cubes = [_cube for _cube in cover if _cube != cube]
+        if all([any([minterm & mask == value for value, mask in other_cubes])
+                for minterm in minterms if minterm & cube[1] == cube[0]]):
+            cover = other_cubes
+    return cover
+
+
+def convert_cube_to_function(variables, cube):
+    value, mask = cube
+    literals = list()
+    for i in range(0, len(variables)):
+        if mask & (1 << i):
+            literals.append(variables[i] if value & (1 << i) else Not(variables[i]))
+    return And(*literals)
+
+
+def minimize_sop(variables, minterms, dontcares=None, method='auto'):
+    """Minimal sum of products like sympy SOPform.
+
+    Exact Quine-McCluskey minimization with minimum cover of prime implicants is used for small functions
+    ('exact' method), Espresso-like expansion of cubes for large ones ('heuristic' method).
+    """
+    variables = list(variables)
+    variables_count = len(variables)
+    minterms = set([get_minterm_value(minterm, variables_count) for minterm in minterms])
+    dontcares = set([get_minterm_value(dontcare, variables_count) for dontcare in dontcares or ()]) - minterms
+    if not minterms:
+        return Or()
+    if method == 'auto' and variables_count > exact_max_variables:
+        method = 'heuristic'
+    if method in ('auto', 'exact'):
+        full_mask = (1 << variables_count) - 1
+        prime_implicants = generate_prime_implicants([(minterm, full_mask) for minterm in minterms | dontcares])
+        if method == 'auto':
+            method = 'exact' if len(prime_implicants) <= exact_max_prime_implicants else 'heuristic'
+    if method == 'exact':
+        cover = select_cover(prime_implicants, sorted(minterms))
+    else:
+        cover = expand_cubes(minterms, dontcares, variables_count)
+    return Or(*[convert_cube_to_function(variables, cube) for cube in sorted(cover)])
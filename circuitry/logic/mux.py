@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from circuitry.logic.netlist import Netlist
+
+
+def _add_enable(netlist, enable_functions):
+    """Node of conjunction of enable functions or None if there are no them"""
+    enable_nodes = [netlist.add_function(function) for function in enable_functions]
+    if not enable_nodes:
+        return None
+    return enable_nodes[0] if len(enable_nodes) == 1 else netlist.add_gate('and', enable_nodes)
+
+
+def _add_selection(netlist, address, low, high):
+    # Branches are nodes or constant False for data signals that are not present
+    if low is False and high is False:
+        return False
+    if high is False:
+        return netlist.add_gate('and', (netlist.add_gate('not', (address,)), low))
+    if low is False:
+        return netlist.add_gate('and', (address, high))
+    if low == high:
+        return low
+    return netlist.add_gate('or', (netlist.add_gate('and', (netlist.add_gate('not', (address,)), low)),
+                                   netlist.add_gate('and', (address, high))))
+
+
+def generate_mux_tree_netlist(address_signals, data_signals, enable_functions=(), input_names=None):
+    """Netlist of multiplexer built as balanced tree of 2:1 multiplexers.
+
+    Level i of tree is selected by address_signals[i] (the least significant bit first), data signals missing for
+    large addresses are 0. Output is and-ed with enable functions (sympy, e.g. strobe function). Inputs of netlist
+    are input_names (in their order) if given.
+    """
+    netlist = Netlist(input_names or [str(signal) for signal in list(address_signals) + list(data_signals)])
+    level = [netlist.add_input(signal) for signal in data_signals[:2 ** len(address_signals)]]
+    for address_signal in address_signals:
+        address = netlist.add_input(address_signal)
+        level = [_add_selection(netlist, address, level[i], level[i + 1] if i + 1 < len(level) else False)
+                 for i in xrange(0, len(level), 2)]
+    output = level[0] if level else False
+    enable = _add_enable(netlist, enable_functions)
+    if output is False:
+        netlist.outputs = [netlist.add_constant(False)]
+    elif enable is None:
+        netlist.outputs = [output]
+    else:
+        netlist.outputs = [netlist.add_gate('and', (enable, output))]
+    return netlist
+
+
+def _add_decoder_lines(netlist, address_nodes, lines_count, enable=None):
+    """Nodes of the first lines_count one-hot lines for address nodes, address is split to halves decoded separately
+    and enable is and-ed with lines of the lower half only
+    """
+    if len(address_nodes) == 1:
+        lines = [netlist.add_gate('not', address_nodes), address_nodes[0]][:lines_count]
+        if enable is not None:
+            lines = [netlist.add_gate('and', (enable, line)) for line in lines]
+        return lines
+    half = len(address_nodes) // 2
+    low_count = min(2 ** half, lines_count)
+    low_lines = _add_decoder_lines(netlist, address_nodes[:half], low_count, enable)
+    high_lines = _add_decoder_lines(netlist, address_nodes[half:], (lines_count + low_count - 1) // low_count)
+    return [netlist.add_gate('and', (high_line, low_line))
+            for high_line in high_lines for low_line in low_lines][:lines_count]
+
+
+def generate_decoder_netlist(address_signals, outputs_count, enable_functions=(), input_names=None):
+    """Netlist of decoder with predecoders, output i is true if address is i and all enable functions are true.
+
+    Each half of address is decoded once and its lines are shared by all outputs, so there is one two-input gate
+    for each output and only about square root of outputs count gates in predecoders. Inputs of netlist are
+    input_names (in their order) if given.
+    """
+    netlist = Netlist(input_names or [str(signal) for signal in address_signals])
+    address_nodes = [netlist.add_input(signal) for signal in address_signals]
+    enable = _add_enable(netlist, enable_functions)
+    outputs_count = min(outputs_count, 2 ** len(address_nodes))
+    if not address_nodes:
+        lines = [enable if enable is not None else netlist.add_constant(True)][:outputs_count]
+    else:
+        lines = _add_decoder_lines(netlist, address_nodes, outputs_count, enable)
+    netlist.outputs = lines
+    return netlist
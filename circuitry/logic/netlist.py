@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from sympy import Symbol
+from sympy.logic import And, Or, Xor, Not
+
+from circuitry.exceptions import LogicFunctionNotSpecified
+from circuitry.logic import get_function_name, get_constant_value
+
+
+class Netlist(object):
+    """Directed acyclic graph of logic gates with structural hashing, nodes are stored in arrays"""
+    commutative_operations = ('and', 'or', 'xor')
+
+    def __init__(self, input_names=None):
+        # Operation ('input', 'constant', 'and', 'or', 'xor', 'not') and operands of each node
+        self.operations = list()
+        self.operands = list()
+        # Signal name for inputs, value for constants
+        self.values = list()
+        self.inputs = list()
+        self.outputs = list()
+        self._nodes = dict()
+        self._inputs_by_name = dict()
+        for input_name in input_names or ():
+            self.add_input(input_name)
+
+    @classmethod
+    def from_functions(cls, functions, input_names=None):
+        netlist = cls(input_names)
+        added_functions = dict()
+        for function in functions:
+            netlist.outputs.append(netlist.add_function(function, added_functions))
+        return netlist
+
+    def __len__(self):
+        return len(self.operations)
+
+    def _add_node(self, operation, operands, value=None):
+        # Operands of commutative gates are hashed in sorted order but kept in order they are given
+        if operation in self.commutative_operations:
+            node_key = (operation, tuple(sorted(operands)), value)
+        else:
+            node_key = (operation, operands, value)
+        if node_key not in self._nodes:
+            self.operations.append(operation)
+            self.operands.append(operands)
+            self.values.append(value)
+            self._nodes[node_key] = len(self.operations) - 1
+        return self._nodes[node_key]
+
+    def add_input(self, name):
+        name = str(name)
+        if name not in self._inputs_by_name:
+            self._inputs_by_name[name] = self._add_node('input', (), name)
+            self.inputs.append(self._inputs_by_name[name])
+        return self._inputs_by_name[name]
+
+    def add_constant(self, value):
+        return self._add_node('constant', (), bool(value))
+
+    def add_gate(self, operation, operands):
+        return self._add_node(operation, tuple(operands))
+
+    def add_function(self, function, added_functions=None):
+        """Add sympy logic function, equal subexpressions are added once"""
+        if added_functions is None:
+            added_functions = dict()
+        if function in added_functions:
+            return added_functions[function]
+        function_name = get_function_name(function)
+        if function_name is None:
+            constant_value = get_constant_value(function)
+            if constant_value is None:
+                node = self.add_input(function)
+            else:
+                node = self.add_constant(constant_value)
+        else:
+            operands = [self.add_function(arg, added_functions) for arg in function.args]
+            if function_name in ('And', 'Or', 'Xor', 'Not'):
+                node = self.add_gate(function_name.lower(), operands)
+            elif function_name == 'Nand':
+                node = self.add_gate('not', [self.add_gate('and', operands)])
+            elif function_name == 'Nor':
+                node = self.add_gate('not', [self.add_gate('or', operands)])
+            elif function_name == 'Implies':
+                node = self.add_gate('or', [self.add_gate('not', operands[:1]), operands[1]])
+            elif function_name == 'Equivalent':
+                node = self.add_gate('or', [self.add_gate('and', operands),
+                                            self.add_gate('and', [self.add_gate('not', [_operand])
+                                                                  for _operand in operands])])
+            elif function_name == 'ITE':
+                node = self.add_gate('or', [self.add_gate('and', operands[:2]),
+                                            self.add_gate('and', [self.add_gate('not', operands[:1]), operands[2]])])
+            else:
+                raise LogicFunctionNotSpecified(function_name)
+        added_functions[function] = node
+        return node
+
+    def reachable_nodes(self, outputs=None):
+        """Numbers of nodes used by outputs in topological order"""
+        if outputs is None:
+            outputs = self.outputs
+        is_reachable = [False] * len(self.operations)
+        for node in outputs:
+            is_reachable[node] = True
+        # Operands always have smaller numbers than gates
+        for node in xrange(len(self.operations) - 1, -1, -1):
+            if is_reachable[node]:
+                for operand in self.operands[node]:
+                    is_reachable[operand] = True
+        return [node for node in xrange(0, len(self.operations)) if is_reachable[node]]
+
+    def get_support(self, outputs=None):
+        """Names of inputs used by outputs in order of inputs"""
+        reachable_nodes = set(self.reachable_nodes(outputs))
+        return [self.values[node] for node in self.inputs if node in reachable_nodes]
+
+    def count_gates(self, outputs=None):
+        """Number of gates used by outputs, inputs and constants are not counted"""
+        return len([node for node in self.reachable_nodes(outputs)
+                    if self.operations[node] not in ('input', 'constant')])
+
+    def get_depth(self, outputs=None):
+        """Logic depth, the largest number of gates on path from inputs to outputs"""
+        if outputs is None:
+            outputs = self.outputs
+        depths = dict()
+        for node in self.reachable_nodes(outputs):
+            operands_depth = max([depths[operand] for operand in self.operands[node]] or [0])
+            depths[node] = operands_depth + (0 if self.operations[node] in ('input', 'constant') else 1)
+        return max([depths[node] for node in outputs] or [0])
+
+    def to_functions(self, outputs=None):
+        """Sympy logic functions of outputs, nodes used by several outputs are converted once"""
+        if outputs is None:
+            outputs = self.outputs
+        functions = dict()
+        for node in self.reachable_nodes(outputs):
+            operation = self.operations[node]
+            operands = [functions[operand] for operand in self.operands[node]]
+            if operation == 'input':
+                functions[node] = Symbol(self.values[node])
+            elif operation == 'constant':
+                functions[node] = self.values[node]
+            elif operation == 'not':
+                functions[node] = Not(operands[0])
+            else:
+                functions[node] = {'and': And, 'or': Or, 'xor': Xor}[operation](*operands)
+        return [functions[node] for node in outputs]
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+import numpy
+
+from circuitry.exceptions import LogicFunctionNotSpecified, SignalsNotSpecified
+from circuitry.logic import get_function_name, get_constant_value
+
+
+_NUMPY_OPERATIONS = {
+    'And': lambda args: numpy.logical_and.reduce(args),
+    'Or': lambda args: numpy.logical_or.reduce(args),
+    'Xor': lambda args: numpy.logical_xor.reduce(args),
+    'Not': lambda args: numpy.logical_not(args[0]),
+    'Nand': lambda args: numpy.logical_not(numpy.logical_and.reduce(args)),
+    'Nor': lambda args: numpy.logical_not(numpy.logical_or.reduce(args)),
+    'Implies': lambda args: numpy.logical_or(numpy.logical_not(args[0]), args[1]),
+    'Equivalent': lambda args: numpy.logical_or(numpy.logical_and.reduce(args),
+                                                numpy.logical_not(numpy.logical_or.reduce(args))),
+    'ITE': lambda args: numpy.where(args[0], args[1], args[2])
+}
+
+
+def generate_input_matrix(signals_list, start=0, stop=None):
+    """Columns of input combinations from start to stop row in the order used by truth tables"""
+    input_signals_len = sum([len(signals) for signals in signals_list])
+    if stop is None:
+        stop = 2 ** input_signals_len
+    row_numbers = numpy.arange(start, stop, dtype=numpy.int64)
+    columns = list()
+    shift = input_signals_len
+    for signals in signals_list:
+        shift -= len(signals)
+        for i in range(0, len(signals)):
+            columns.append(((row_numbers >> (shift + i)) & 1).astype(numpy.bool_))
+    return columns
+
+
+def get_words(columns, dtype=numpy.int64):
+    """Integer values of signals from columns of their bits, bit i is taken from columns[i]"""
+    words = numpy.zeros(len(columns[0]), dtype=dtype)
+    for i, column in enumerate(columns):
+        words |= numpy.asarray(column, dtype=dtype) << i
+    return words
+
+
+def get_bit_columns(words, width):
+    """Columns of bits 0 to width - 1 of integer words (inverse of get_words), width is at most 64"""
+    words_bytes = numpy.ascontiguousarray(words, dtype='<u8').view(numpy.uint8).reshape(-1, 8)
+    bytes_columns = [numpy.ascontiguousarray(words_bytes[:, i]) for i in xrange(0, (width + 7) // 8)]
+    return [(bytes_columns[i // 8] >> (i % 8)) & 1 for i in xrange(0, width)]
+
+
+def pack_columns(columns):
+    """Columns of bits (booleans or integers 0 and 1) packed to rows of unsigned 64 bits words, 64 vectors in a word.
+
+    Bits are ordered in words by bytes of platform, bitwise operations do not depend on it, unpack_columns restores
+    columns. Rows are padded with zeros to multiple of 64 vectors.
+    """
+    rows_count = len(columns[0]) if len(columns) else 0
+    packed_columns = numpy.zeros((len(columns), (rows_count + 63) // 64 * 8), dtype=numpy.uint8)
+    for packed_column, column in zip(packed_columns, columns):
+        packed_bytes = numpy.packbits(column)
+        packed_column[:len(packed_bytes)] = packed_bytes
+    return packed_columns.view(numpy.uint64)
+
+
+def unpack_columns(words, rows_count):
+    """Columns of rows_count bits (0 and 1) from rows of words packed by pack_columns"""
+    words = numpy.ascontiguousarray(words, dtype=numpy.uint64).reshape(len(words), (rows_count + 63) // 64)
+    return numpy.unpackbits(words.view(numpy.uint8), axis=1)[:, :rows_count]
+
+
+class NumpyKernel(object):
+    """Logic functions compiled once to a sequence of vectorized NumPy operations"""
+
+    def __init__(self, functions):
+        self._program = list()
+        self._symbols = list()
+        self._outputs = list()
+        positions = dict()
+        for function in functions:
+            self._outputs.append(self._compile(function, positions))
+
+    def _compile(self, function, positions):
+        if function in positions:
+            return positions[function]
+        function_name = get_function_name(function)
+        if function_name is None:
+            constant_value = get_constant_value(function)
+            if constant_value is None:
+                self._symbols.append(str(function))
+                operation = ('symbol', str(function))
+            else:
+                operation = ('constant', constant_value)
+        else:
+            if function_name not in _NUMPY_OPERATIONS:
+                raise LogicFunctionNotSpecified(function_name)
+            operation = (function_name, tuple([self._compile(arg, positions) for arg in function.args]))
+        self._program.append(operation)
+        positions[function] = len(self._program) - 1
+        return positions[function]
+
+    @property
+    def symbols(self):
+        return list(self._symbols)
+
+    def __call__(self, columns, rows_count):
+        """Evaluate functions over columns dict (signal name -> boolean array or constant)"""
+        unknown_symbols = [_symbol for _symbol in self._symbols if _symbol not in columns]
+        if unknown_symbols:
+            raise SignalsNotSpecified(tuple(unknown_symbols))
+        values = list()
+        for operation, operands in self._program:
+            if operation == 'symbol':
+                value = columns[operands]
+                if numpy.isscalar(value):
+                    value = numpy.repeat(bool(value), rows_count)
+            elif operation == 'constant':
+                value = numpy.repeat(operands, rows_count)
+            else:
+                value = _NUMPY_OPERATIONS[operation]([values[_i] for _i in operands])
+            values.append(value)
+        return [values[_i] for _i in self._outputs]
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from circuitry.exceptions import OptimizationPassNotSupported
+from circuitry.logic.netlist import Netlist
+
+
+optimization_passes = ('hashing', 'constants', 'inverters', 'absorption')
+
+
+def _add_gate(netlist, operation, operands):
+    """Gate of operands, gates of one operand are the operand itself and gates of no operands are constants"""
+    if not operands:
+        return netlist.add_constant(operation == 'and')
+    if len(operands) == 1 and operation != 'not':
+        return operands[0]
+    return netlist.add_gate(operation, operands)
+
+
+def _simplify_hashing(netlist, operation, operands):
+    # Repeated operands of conjunctions and disjunctions are removed, equal operands of exclusive disjunctions cancel
+    if operation in ('and', 'or'):
+        unique_operands = list()
+        for operand in operands:
+            if operand not in unique_operands:
+                unique_operands.append(operand)
+        operands = unique_operands
+    elif operation == 'xor':
+        operands = [operand for i, operand in enumerate(operands)
+                    if operands.index(operand) == i and operands.count(operand) % 2]
+    return _add_gate(netlist, operation, operands)
+
+
+def _simplify_constants(netlist, operation, operands):
+    values = [netlist.values[operand] for operand in operands if netlist.operations[operand] == 'constant']
+    operands = [operand for operand in operands if netlist.operations[operand] != 'constant']
+    if not values:
+        return _add_gate(netlist, operation, operands)
+    if operation == 'not':
+        return netlist.add_constant(not values[0])
+    if operation == 'and' and False in values:
+        return netlist.add_constant(False)
+    if operation == 'or' and True in values:
+        return netlist.add_constant(True)
+    if operation == 'xor' and sum(values) % 2:
+        if not operands:
+            return netlist.add_constant(True)
+        return netlist.add_gate('not', (_add_gate(netlist, 'xor', operands),))
+    return _add_gate(netlist, operation, operands)
+
+
+def _simplify_inverters(netlist, operation, operands):
+    if operation == 'not' and netlist.operations[operands[0]] == 'not':
+        return netlist.operands[operands[0]][0]
+    if operation == 'xor':
+        inverted_operands = [operand for operand in operands if netlist.operations[operand] == 'not']
+        # Even number of inverters of operands cancel, so they are removed
+        if inverted_operands and not len(inverted_operands) % 2:
+            operands = [netlist.operands[operand][0] if netlist.operations[operand] == 'not' else operand
+                        for operand in operands]
+    return _add_gate(netlist, operation, operands)
+
+
+def _simplify_absorption(netlist, operation, operands):
+    if operation not in ('and', 'or'):
+        return _add_gate(netlist, operation, operands)
+    operands_set = set(operands)
+    # x & ~x = 0, x | ~x = 1
+    for operand in operands:
+        if netlist.operations[operand] == 'not' and netlist.operands[operand][0] in operands_set:
+            return netlist.add_constant(operation == 'or')
+    # x & (x | y) = x, x | (x & y) = x
+    dual_operation = 'or' if operation == 'and' else 'and'
+    operands = [operand for operand in operands if netlist.operations[operand] != dual_operation or
+                operands_set.isdisjoint(netlist.operands[operand])]
+    return _add_gate(netlist, operation, operands)
+
+
+_simplify_functions = {
+    'hashing': _simplify_hashing,
+    'constants': _simplify_constants,
+    'inverters': _simplify_inverters,
+    'absorption': _simplify_absorption
+}
+
+
+def _rebuild_netlist(netlist, simplify_function, input_values=None):
+    """Netlist with each gate used by outputs replaced by node of simplify_function, inputs keep their order and
+    inputs of input_values (dict by names) are replaced by constants
+    """
+    rebuilt_netlist = Netlist([netlist.values[node] for node in netlist.inputs])
+    rebuilt_nodes = dict()
+    for node in netlist.reachable_nodes():
+        operation = netlist.operations[node]
+        if operation == 'input' and input_values and netlist.values[node] in input_values:
+            rebuilt_node = rebuilt_netlist.add_constant(input_values[netlist.values[node]])
+        elif operation == 'input':
+            rebuilt_node = rebuilt_netlist.add_input(netlist.values[node])
+        elif operation == 'constant':
+            rebuilt_node = rebuilt_netlist.add_constant(netlist.values[node])
+        else:
+            rebuilt_node = simplify_function(rebuilt_netlist, operation,
+                                             [rebuilt_nodes[operand] for operand in netlist.operands[node]])
+        rebuilt_nodes[node] = rebuilt_node
+    rebuilt_netlist.outputs = [rebuilt_nodes[node] for node in netlist.outputs]
+    return rebuilt_netlist
+
+
+def optimize_netlist(netlist, passes=optimization_passes, max_rounds=4):
+    """Netlist with passes applied in order while they remove gates (at most max_rounds times).
+
+    Passes are structural hashing ('hashing', equal gates are shared, repeated operands removed), constant
+    propagation ('constants'), double inversion removal ('inverters') and absorption ('absorption'). Inputs are never
+    replaced by constants (see substitute_inputs), so strobe signals stay inputs. Returns optimized netlist and
+    report of gates removed by each pass, gate count and logic depth before and after optimization.
+    """
+    for optimization_pass in passes:
+        if optimization_pass not in _simplify_functions:
+            raise OptimizationPassNotSupported(optimization_pass)
+    report = {
+        'gates_before': netlist.count_gates(),
+        'depth_before': netlist.get_depth(),
+        'removed': dict([(optimization_pass, 0) for optimization_pass in passes])
+    }
+    gates_count = report['gates_before']
+    for _ in xrange(0, max_rounds if passes else 0):
+        round_gates_count = gates_count
+        for optimization_pass in passes:
+            netlist = _rebuild_netlist(netlist, _simplify_functions[optimization_pass])
+            report['removed'][optimization_pass] += gates_count - netlist.count_gates()
+            gates_count = netlist.count_gates()
+        if gates_count == round_gates_count:
+            break
+    report['gates_after'] = gates_count
+    report['depth_after'] = netlist.get_depth()
+    return netlist, report
+
+
+def substitute_inputs(netlist, input_values, passes=optimization_passes):
+    """Netlist with inputs of input_values (dict by names, e.g. substitutions of strobe signals) replaced by
+    constants, propagated through gates and optimized by passes. Replaced inputs are kept unused in inputs.
+    """
+    return optimize_netlist(_rebuild_netlist(netlist, _simplify_constants, input_values), passes)[0]
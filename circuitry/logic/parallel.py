@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from multiprocessing import Pool
+
+import numpy
+
+
+_worker_lines_function = None
+
+
+def _initialize_worker(lines_function):
+    global _worker_lines_function
+    _worker_lines_function = lines_function
+
+
+def _evaluate_shard(shard):
+    start, stop = shard
+    return [numpy.packbits(numpy.asarray(line_columns, dtype=numpy.bool_).reshape(-1, stop - start), axis=1)
+            for line_columns in _worker_lines_function(start, stop)]
+
+
+def generate_shards(rows_count, shards_count):
+    """Split rows to contiguous shards, all shards except the last one start and stop at multiples of 8"""
+    shard_size = max(8, ((rows_count + shards_count - 1) // shards_count + 7) // 8 * 8)
+    return [(start, min(start + shard_size, rows_count)) for start in xrange(0, rows_count, shard_size)]
+
+
+def generate_packed_lines(lines_function, rows_count, workers, shards_per_worker=4):
+    """Evaluate lines function of (start, stop) over all rows in worker processes.
+
+    Lines function is passed to workers once by pool initializer, then only shard bounds are sent to them.
+    Returns arrays of shape (line width, bytes) with rows packed in order for each line.
+    """
+    if not rows_count:
+        return list()
+    shards = generate_shards(rows_count, workers * shards_per_worker)
+    pool = Pool(processes=workers, initializer=_initialize_worker, initargs=(lines_function,))
+    try:
+        shards_columns = pool.map(_evaluate_shard, shards)
+    finally:
+        pool.close()
+        pool.join()
+    return [numpy.concatenate([shard_columns[line_number] for shard_columns in shards_columns], axis=1)
+            for line_number in range(0, len(shards_columns[0]))]
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from circuitry.exceptions import ArchitectureNotSupported
+from circuitry.logic.netlist import Netlist
+
+
+def _generate_ripple_levels(width):
+    return [[(i, i - 1)] for i in xrange(1, width)]
+
+
+def _generate_kogge_stone_levels(width):
+    levels = list()
+    distance = 1
+    while distance < width:
+        levels.append([(i, i - distance) for i in xrange(distance, width)])
+        distance *= 2
+    return levels
+
+
+def _generate_sklansky_levels(width):
+    levels = list()
+    distance = 1
+    while distance < width:
+        levels.append([(i, (i // distance) * distance - 1) for i in xrange(0, width) if i & distance])
+        distance *= 2
+    return levels
+
+
+def _generate_brent_kung_levels(width):
+    levels = list()
+    distance = 1
+    while distance < width:
+        levels.append([(i, i - distance) for i in xrange(2 * distance - 1, width, 2 * distance)])
+        distance *= 2
+    distance //= 2
+    while distance > 1:
+        distance //= 2
+        level = [(i, i - distance) for i in xrange(3 * distance - 1, width, 2 * distance)]
+        if level:
+            levels.append(level)
+    return levels
+
+
+prefix_architectures = {
+    'ripple': _generate_ripple_levels,
+    'kogge-stone': _generate_kogge_stone_levels,
+    'brent-kung': _generate_brent_kung_levels,
+    'sklansky': _generate_sklansky_levels
+}
+
+
+def generate_prefix_levels(width, architecture='ripple'):
+    """Levels of prefix operations (i, j), span ending at bit i is extended by span ending at bit j < i.
+
+    Operations of one level use spans computed by previous levels, after all levels span ending at bit i starts at 0.
+    """
+    if architecture not in prefix_architectures:
+        raise ArchitectureNotSupported(architecture)
+    return prefix_architectures[architecture](width)
+
+
+def _conjunction(netlist, first, second):
+    # Operands are nodes or constants True and False
+    if first is False or second is False:
+        return False
+    if first is True:
+        return second
+    if second is True:
+        return first
+    return netlist.add_gate('and', (first, second))
+
+
+def _disjunction(netlist, first, second):
+    if first is True or second is True:
+        return True
+    if first is False:
+        return second
+    if second is False:
+        return first
+    return netlist.add_gate('or', (first, second))
+
+
+def _exclusive_disjunction(netlist, first, second):
+    if isinstance(first, bool):
+        first, second = second, first
+    if isinstance(first, bool):
+        return first != second
+    if second is False:
+        return first
+    if second is True:
+        return netlist.add_gate('not', (first,))
+    return netlist.add_gate('xor', (first, second))
+
+
+def generate_adder_netlist(first_signals, second_signals, architecture='ripple'):
+    """Netlist of adder with carries computed by parallel-prefix network of generate and propagate signals.
+
+    Operands are lists of signals or constant bits (0 and 1). Outputs are sum bits, carry (overflow)
+    and two's complement overflow, operations with constants are folded.
+    """
+    input_names = [str(signal) for signal in list(first_signals) + list(second_signals)
+                   if not isinstance(signal, (bool, int, long))]
+    netlist = Netlist(input_names)
+
+    def _get_operand(signals, i):
+        if i >= len(signals):
+            return False
+        if isinstance(signals[i], (bool, int, long)):
+            return bool(signals[i])
+        return netlist.add_input(signals[i])
+    width = max(len(first_signals), len(second_signals))
+    first = [_get_operand(first_signals, i) for i in xrange(0, width)]
+    second = [_get_operand(second_signals, i) for i in xrange(0, width)]
+    generates = [_conjunction(netlist, x, y) for x, y in zip(first, second)]
+    propagates = [_exclusive_disjunction(netlist, x, y) for x, y in zip(first, second)]
+    # Generate and propagate signals of spans ending at each bit
+    spans = zip(generates, propagates)
+    for level in generate_prefix_levels(width, architecture):
+        previous_spans = list(spans)
+        for i, j in level:
+            (generate_high, propagate_high), (generate_low, propagate_low) = previous_spans[i], previous_spans[j]
+            spans[i] = (_disjunction(netlist, generate_high, _conjunction(netlist, propagate_high, generate_low)),
+                        _conjunction(netlist, propagate_high, propagate_low))
+    carries = [False] + [generate for generate, _ in spans]
+    outputs = [_exclusive_disjunction(netlist, propagate, carry) for propagate, carry in zip(propagates, carries)]
+    outputs.append(carries[width])
+    outputs.append(_exclusive_disjunction(netlist, carries[width - 1], carries[width]))
+    netlist.outputs = [netlist.add_constant(output) if isinstance(output, bool) else output for output in outputs]
+    return netlist
@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from heapq import heappush, heappop
+
+
+def generate_luby_sequence():
+    """Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, ... of restart intervals"""
+    i = 1
+    while True:
+        size, power = 1, 1
+        while size < i + 1:
+            size, power = 2 * size + 1, 2 * power
+        current_i = i
+        while size - 1 != current_i:
+            size = (size - 1) // 2
+            power //= 2
+            current_i %= size
+        yield power
+        i += 1
+
+
+class CDCLSolver(object):
+    """Conflict-driven clause learning SAT solver.
+
+    Variables are positive numbers, literals are variables or their negations like in DIMACS format. Two literals
+    of each clause are watched for unit propagation, conflicts are analyzed to the first unique implication point,
+    decisions are made by activity of variables (VSIDS) with saved phases, search is restarted by Luby sequence.
+    """
+    activity_decay = 0.95
+    restart_interval = 100
+
+    def __init__(self):
+        # Literals are coded as 2 * variable + 1 for negations, clauses are lists of codes
+        self._clauses = list()
+        self._units = list()
+        self._watches = [list(), list()]
+        self._values = [None]
+        self._levels = [0]
+        self._reasons = [None]
+        self._activities = [0.0]
+        self._phases = [0]
+        self._order = list()
+        self._trail = list()
+        self._trail_limits = list()
+        self._propagated = 0
+        self._activity_increment = 1.0
+        self._is_unsatisfiable = False
+        self.conflicts = 0
+
+    @property
+    def variables_count(self):
+        return len(self._values) - 1
+
+    def new_variable(self):
+        self._values.append(None)
+        self._levels.append(0)
+        self._reasons.append(None)
+        self._activities.append(0.0)
+        self._phases.append(0)
+        self._watches.extend([list(), list()])
+        heappush(self._order, (0.0, len(self._values) - 1))
+        return len(self._values) - 1
+
+    def add_clause(self, literals):
+        codes = set()
+        for literal in literals:
+            while abs(literal) > self.variables_count:
+                self.new_variable()
+            code = 2 * abs(literal) + (literal < 0)
+            if code ^ 1 in codes:
+                return
+            codes.add(code)
+        codes = list(codes)
+        if not codes:
+            self._is_unsatisfiable = True
+        elif len(codes) == 1:
+            self._units.append(codes[0])
+        else:
+            self._attach_clause(codes)
+
+    def _attach_clause(self, codes):
+        self._clauses.append(codes)
+        self._watches[codes[0]].append(len(self._clauses) - 1)
+        self._watches[codes[1]].append(len(self._clauses) - 1)
+        return len(self._clauses) - 1
+
+    def _get_value(self, code):
+        value = self._values[code >> 1]
+        return None if value is None else value ^ (code & 1)
+
+    def _enqueue(self, code, reason):
+        variable = code >> 1
+        self._values[variable] = 1 - (code & 1)
+        self._levels[variable] = len(self._trail_limits)
+        self._reasons[variable] = reason
+        self._trail.append(code)
+
+    def _propagate(self):
+        """Unit propagation of trail, returns conflicting clause number or None"""
+        values, watches, clauses = self._values, self._watches, self._clauses
+        while self._propagated < len(self._trail):
+            false_code = self._trail[self._propagated] ^ 1
+            self._propagated += 1
+            watch_list = watches[false_code]
+            kept_watches = list()
+            i = 0
+            while i < len(watch_list):
+                clause_number = watch_list[i]
+                i += 1
+                clause = clauses[clause_number]
+                if clause[0] == false_code:
+                    clause[0], clause[1] = clause[1], false_code
+                first = clause[0]
+                first_value = values[first >> 1]
+                if first_value is not None and first_value ^ (first & 1):
+                    kept_watches.append(clause_number)
+                    continue
+                for k in xrange(2, len(clause)):
+                    value = values[clause[k] >> 1]
+                    if value is None or value ^ (clause[k] & 1):
+                        clause[1], clause[k] = clause[k], false_code
+                        watches[clause[1]].append(clause_number)
+                        break
+                else:
+                    kept_watches.append(clause_number)
+                    if first_value is not None:
+                        kept_watches.extend(watch_list[i:])
+                        watches[false_code] = kept_watches
+                        return clause_number
+                    self._enqueue(first, clause_number)
+            watches[false_code] = kept_watches
+        return None
+
+    def _bump_activity(self, variable):
+        self._activities[variable] += self._activity_increment
+        if self._activities[variable] > 1e100:
+            self._activities = [activity * 1e-100 for activity in self._activities]
+            self._activity_increment *= 1e-100
+            self._order = [(-self._activities[_variable], _variable) for _variable in xrange(1, len(self._values))
+                           if self._values[_variable] is None]
+            self._order.sort()
+        elif self._values[variable] is None:
+            heappush(self._order, (-self._activities[variable], variable))
+
+    def _analyze(self, clause_number):
+        """Learnt clause asserting at the first unique implication point and level to backtrack to"""
+        level = len(self._trail_limits)
+        seen = set()
+        learnt = [None]
+        counter = 0
+        code = None
+        index = len(self._trail) - 1
+        clause = self._clauses[clause_number]
+        while True:
+            for other_code in (clause if code is None else clause[1:]):
+                variable = other_code >> 1
+                if variable not in seen and self._levels[variable] > 0:
+                    seen.add(variable)
+                    self._bump_activity(variable)
+                    if self._levels[variable] >= level:
+                        counter += 1
+                    else:
+                        learnt.append(other_code)
+            while self._trail[index] >> 1 not in seen:
+                index -= 1
+            code = self._trail[index]
+            index -= 1
+            counter -= 1
+            if not counter:
+                break
+            clause = self._clauses[self._reasons[code >> 1]]
+        learnt[0] = code ^ 1
+        backtrack_level = 0
+        if len(learnt) > 1:
+            highest = max(xrange(1, len(learnt)), key=lambda i: self._levels[learnt[i] >> 1])
+            learnt[1], learnt[highest] = learnt[highest], learnt[1]
+            backtrack_level = self._levels[learnt[1] >> 1]
+        return learnt, backtrack_level
+
+    def _backtrack(self, level):
+        if len(self._trail_limits) <= level:
+            return
+        for code in self._trail[self._trail_limits[level]:]:
+            variable = code >> 1
+            self._phases[variable] = self._values[variable]
+            self._values[variable] = None
+            self._reasons[variable] = None
+            heappush(self._order, (-self._activities[variable], variable))
+        del self._trail[self._trail_limits[level]:]
+        del self._trail_limits[level:]
+        self._propagated = len(self._trail)
+
+    def _pick_variable(self):
+        while self._order:
+            activity, variable = heappop(self._order)
+            if self._values[variable] is None and -activity == self._activities[variable]:
+                return variable
+        for variable in xrange(1, len(self._values)):
+            if self._values[variable] is None:
+                return variable
+        return None
+
+    def solve(self):
+        """Values of variables (dict variable -> True or False) satisfying all clauses or None"""
+        if self._is_unsatisfiable:
+            return None
+        self._backtrack(0)
+        for code in self._units:
+            value = self._get_value(code)
+            if value == 0:
+                return None
+            elif value is None:
+                self._enqueue(code, None)
+        luby_sequence = generate_luby_sequence()
+        restart_conflicts = self.conflicts + self.restart_interval * next(luby_sequence)
+        while True:
+            clause_number = self._propagate()
+            if clause_number is not None:
+                self.conflicts += 1
+                if not self._trail_limits:
+                    self._is_unsatisfiable = True
+                    return None
+                learnt, backtrack_level = self._analyze(clause_number)
+                self._backtrack(backtrack_level)
+                if len(learnt) == 1:
+                    self._units.append(learnt[0])
+                    self._enqueue(learnt[0], None)
+                else:
+                    self._enqueue(learnt[0], self._attach_clause(learnt))
+                self._activity_increment /= self.activity_decay
+                if self.conflicts >= restart_conflicts:
+                    restart_conflicts = self.conflicts + self.restart_interval * next(luby_sequence)
+                    self._backtrack(0)
+            else:
+                variable = self._pick_variable()
+                if variable is None:
+                    return dict([(_variable, bool(self._values[_variable]))
+                                 for _variable in xrange(1, len(self._values))])
+                self._trail_limits.append(len(self._trail))
+                self._enqueue(2 * variable + (1 - self._phases[variable]), None)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from collections import deque
+from heapq import heappush, heappop
+
+from circuitry.logic.timing import get_gate_delay
+
+
+def _evaluate_gate(operation, operand_values):
+    if operation == 'and':
+        return min(operand_values)
+    elif operation == 'or':
+        return max(operand_values)
+    elif operation == 'xor':
+        return sum(operand_values) & 1
+    return 1 - operand_values[0]
+
+
+def simulate(netlist, stimulus, delay_model=None, initial_values=None, output_names=None, max_records=10000):
+    """Event-driven simulation of netlist with transport delays of gates (see analyze_timing for delay_model).
+
+    Stimulus is iterable of pairs (time, dict of input values by name) in order of time, it is read as simulation
+    goes, so it may be a generator of any length. Inputs start at initial_values (0 by default) with all gates settled.
+    Output transitions (time, name, value) and glitches (name, start, end), pulses of outputs changed twice after the
+    same stimulus, are counted and the last max_records of each are kept.
+    """
+    initial_values = initial_values or dict()
+    nodes = netlist.reachable_nodes()
+    inputs_by_name = dict([(netlist.values[node], node) for node in netlist.inputs])
+    if output_names is None:
+        output_names = ['output%d' % i for i in xrange(0, len(netlist.outputs))]
+    outputs_by_node = dict()
+    for name, node in zip(output_names, netlist.outputs):
+        outputs_by_node.setdefault(node, list()).append(str(name))
+    delays = [0] * len(netlist)
+    fanouts = [list() for _ in xrange(0, len(netlist))]
+    values = [0] * len(netlist)
+    for node in nodes:
+        operation, operands = netlist.operations[node], netlist.operands[node]
+        delays[node] = get_gate_delay(delay_model or dict(), operation, len(operands))
+        for operand in operands:
+            fanouts[operand].append(node)
+        if operation == 'input':
+            values[node] = int(bool(initial_values.get(netlist.values[node], 0)))
+        elif operation == 'constant':
+            values[node] = int(netlist.values[node])
+        else:
+            values[node] = _evaluate_gate(operation, [values[operand] for operand in operands])
+    # Values gates will have after all scheduled events, new events are scheduled only if they change them
+    scheduled_values = list(values)
+    transitions = deque(maxlen=max_records)
+    glitches = deque(maxlen=max_records)
+    transitions_count, glitches_count, events_count = 0, 0, 0
+    last_transition_times = dict()
+    events = list()
+    event_number = 0
+    stimulus_time, time = None, 0
+    stimulus_iterator = iter(stimulus)
+    next_stimulus = next(stimulus_iterator, None)
+    while events or next_stimulus is not None:
+        time = events[0][0] if events else next_stimulus[0]
+        if next_stimulus is not None and next_stimulus[0] < time:
+            time = next_stimulus[0]
+        # Events of the same time are applied at once, so gates see all changes of their operands
+        changes = dict()
+        while events and events[0][0] == time:
+            _, _, node, value = heappop(events)
+            changes[node] = value
+            events_count += 1
+        while next_stimulus is not None and next_stimulus[0] == time:
+            for name, value in next_stimulus[1].iteritems():
+                if str(name) in inputs_by_name:
+                    changes[inputs_by_name[str(name)]] = int(bool(value))
+                    scheduled_values[inputs_by_name[str(name)]] = int(bool(value))
+            stimulus_time = time
+            next_stimulus = next(stimulus_iterator, None)
+        affected_nodes = set()
+        for node, value in changes.iteritems():
+            if values[node] == value:
+                continue
+            values[node] = value
+            affected_nodes.update(fanouts[node])
+            for name in outputs_by_node.get(node, ()):
+                transitions_count += 1
+                transitions.append((time, name, value))
+                last_transition_time = last_transition_times.get(name)
+                if last_transition_time is not None and stimulus_time is not None and \
+                        last_transition_time >= stimulus_time:
+                    glitches_count += 1
+                    glitches.append((name, last_transition_time, time))
+                last_transition_times[name] = time
+        for node in sorted(affected_nodes):
+            value = _evaluate_gate(netlist.operations[node], [values[operand] for operand in netlist.operands[node]])
+            if value != scheduled_values[node]:
+                scheduled_values[node] = value
+                heappush(events, (time + delays[node], event_number, node, value))
+                event_number += 1
+    return {
+        'time': time,
+        'events': events_count,
+        'transitions_count': transitions_count,
+        'glitches_count': glitches_count,
+        'transitions': list(transitions),
+        'glitches': list(glitches),
+        'values': dict([(str(name), values[node]) for name, node in zip(output_names, netlist.outputs)])
+    }
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from circuitry.exceptions import SignalsNotSpecified
+from circuitry.logic.compiler import generate_gate_statements, compile_source
+
+
+def generate_aligned_blocks(start, stop):
+    """Split rows range to blocks of 2 ** bits rows starting at multiples of their size"""
+    while start < stop:
+        block_bits = 0
+        while not start & (1 << block_bits) and start + (2 << block_bits) <= stop:
+            block_bits += 1
+        yield start, block_bits
+        start += 1 << block_bits
+
+
+class GrayCodeSweep(object):
+    """Netlist evaluation over input combinations in Gray code order.
+
+    One input is flipped per step and only gates in the fan-out cone of that input are evaluated again.
+    """
+
+    def __init__(self, netlist, input_names, constant_values=None):
+        # Flipping input_names[i] flips bit i of row number
+        self._netlist = netlist
+        self._outputs = list(netlist.outputs)
+        nodes = netlist.reachable_nodes()
+        self._gates = [node for node in nodes if netlist.operations[node] != 'input']
+        nodes = set(nodes)
+        nodes_by_name = dict([(netlist.values[node], node) for node in netlist.inputs])
+        self._input_nodes = [nodes_by_name.get(str(input_name)) for input_name in input_names]
+        self._initial_values = [0] * len(netlist)
+        unknown_signals = list()
+        for node in netlist.inputs:
+            if node in self._input_nodes or node not in nodes:
+                continue
+            if constant_values is None or netlist.values[node] not in constant_values:
+                unknown_signals.append(netlist.values[node])
+            else:
+                self._initial_values[node] = int(constant_values[netlist.values[node]]) & 1
+        if unknown_signals:
+            raise SignalsNotSpecified(tuple(unknown_signals))
+        self._update_all = self._compile_update(self._gates)
+        self._cones = list()
+        self._update_cones = list()
+        for input_node in self._input_nodes:
+            cone = list()
+            if input_node is not None:
+                in_cone = {input_node}
+                for node in self._gates:
+                    if any([operand in in_cone for operand in netlist.operands[node]]):
+                        in_cone.add(node)
+                        cone.append(node)
+            self._cones.append(cone)
+            self._update_cones.append(self._compile_update(cone))
+        self.evaluated_gates = 0
+
+    def _compile_update(self, gates):
+        names = dict([(node, 'v[%d]' % node) for node in xrange(0, len(self._netlist))])
+        source_lines = ['def update(v):', '    pass']
+        for node in gates:
+            source_lines.extend(['    %s' % statement
+                                 for statement in generate_gate_statements(self._netlist, node, names, '1')])
+        return compile_source('\n'.join(source_lines) + '\n', 'update')
+
+    @property
+    def gates_count(self):
+        return len(self._gates)
+
+    def sweep(self, start, stop):
+        """Yield row number and output values for rows from start to stop, rows are not in binary order"""
+        outputs = self._outputs
+        for block_start, block_bits in generate_aligned_blocks(start, stop):
+            values = list(self._initial_values)
+            for bit, input_node in enumerate(self._input_nodes):
+                if input_node is not None:
+                    values[input_node] = (block_start >> bit) & 1
+            self._update_all(values)
+            self.evaluated_gates += len(self._gates)
+            row = block_start
+            yield row, [values[node] for node in outputs]
+            for step in xrange(1, 1 << block_bits):
+                # Gray code of step differs from previous one in the lowest set bit of step
+                bit = 0
+                while not step & (1 << bit):
+                    bit += 1
+                row ^= 1 << bit
+                if self._input_nodes[bit] is not None:
+                    values[self._input_nodes[bit]] ^= 1
+                    self._update_cones[bit](values)
+                    self.evaluated_gates += len(self._cones[bit])
+                yield row, [values[node] for node in outputs]
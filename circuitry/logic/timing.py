@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+# Delay of gate of each type: number, pair (intrinsic delay, delay of each input after the first one)
+# or dict of delays by number of inputs. Unit delays make arrival times equal to logic depth
+default_delay_model = {
+    'not': 1,
+    'and': 1,
+    'or': 1,
+    'xor': 1
+}
+
+
+def get_gate_delay(delay_model, operation, fan_in):
+    """Delay of gate of operation with fan_in inputs, inputs and constants have no delay"""
+    if operation in ('input', 'constant'):
+        return 0
+    delay = delay_model.get(operation, default_delay_model[operation])
+    if isinstance(delay, dict):
+        return delay[fan_in]
+    if isinstance(delay, (tuple, list)):
+        intrinsic_delay, input_delay = delay
+        return intrinsic_delay + input_delay * (fan_in - 1)
+    return delay
+
+
+def analyze_timing(netlist, delay_model=None, required_time=None, input_arrival_times=None, output_names=None):
+    """Static timing analysis of netlist.
+
+    Arrival times are propagated from inputs (at input_arrival_times by name, 0 by default) in topological order,
+    required times are propagated back from outputs (at required_time, the largest arrival time by default) in
+    reversed order. Times, slacks and gate delays are lists by node number, None for nodes not used by outputs.
+    """
+    delay_model = delay_model or dict()
+    input_arrival_times = input_arrival_times or dict()
+    nodes = netlist.reachable_nodes()
+    delays = [None] * len(netlist)
+    arrival_times = [None] * len(netlist)
+    # Operand of each gate the latest signal arrives from
+    critical_operands = [None] * len(netlist)
+    for node in nodes:
+        operation, operands = netlist.operations[node], netlist.operands[node]
+        delays[node] = get_gate_delay(delay_model, operation, len(operands))
+        if operation == 'input':
+            arrival_times[node] = input_arrival_times.get(netlist.values[node], 0)
+        elif operation == 'constant':
+            arrival_times[node] = 0
+        else:
+            critical_operands[node] = max(operands, key=lambda operand: arrival_times[operand])
+            arrival_times[node] = arrival_times[critical_operands[node]] + delays[node]
+    delay = max([arrival_times[node] for node in netlist.outputs] or [0])
+    if required_time is None:
+        required_time = delay
+    required_times = [None] * len(netlist)
+    for node in netlist.outputs:
+        required_times[node] = required_time
+    for node in reversed(nodes):
+        operand_required_time = required_times[node] - delays[node]
+        for operand in netlist.operands[node]:
+            if required_times[operand] is None or operand_required_time < required_times[operand]:
+                required_times[operand] = operand_required_time
+    slacks = [None if arrival_time is None else required_times[node] - arrival_time
+              for node, arrival_time in enumerate(arrival_times)]
+    if output_names is None:
+        output_names = ['output%d' % i for i in xrange(0, len(netlist.outputs))]
+    outputs = [{
+        'name': str(name),
+        'node': node,
+        'arrival_time': arrival_times[node],
+        'required_time': required_time,
+        'slack': required_time - arrival_times[node]
+    } for name, node in zip(output_names, netlist.outputs)]
+    critical_path = list()
+    if netlist.outputs:
+        node = max(netlist.outputs, key=lambda output: arrival_times[output])
+        while node is not None:
+            critical_path.append(node)
+            node = critical_operands[node]
+        critical_path.reverse()
+    return {
+        'delay': delay,
+        'required_time': required_time,
+        'delays': delays,
+        'arrival_times': arrival_times,
+        'required_times': required_times,
+        'slacks': slacks,
+        'critical_path': critical_path,
+        'outputs': outputs
+    }
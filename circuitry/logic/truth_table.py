@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+from abc import ABCMeta, abstractmethod
+
+import numpy
+
+
+def join_lines(prefix, lines_columns, length):
+    """Rows (tuples of lists) from prefix lines and arrays of shape (line width, rows) for each line"""
+    prefix = list(prefix)
+    lines = [numpy.asarray(line_columns, dtype=numpy.int8).reshape(-1, length).T.tolist()
+             for line_columns in lines_columns]
+    return [tuple(prefix + [line[i] for line in lines]) for i in xrange(0, length)]
+
+
+class BaseTruthTable(object):
+    """Sequence of truth table rows, rows are tuples of lists like ([strobe], [inputs]..., [outputs])"""
+    __metaclass__ = ABCMeta
+    __slots__ = ('_prefix', '_length')
+
+    rows_per_chunk = 4096
+
+    @abstractmethod
+    def _rows_slice(self, start, stop):
+        """Rows from start to stop"""
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for start in xrange(0, self._length, self.rows_per_chunk):
+            for row in self._rows_slice(start, min(start + self.rows_per_chunk, self._length)):
+                yield row
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in xrange(*item.indices(self._length))]
+        if item < 0:
+            item += self._length
+        if not 0 <= item < self._length:
+            raise IndexError('truth table index out of range')
+        return self._rows_slice(item, item + 1)[0]
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        try:
+            return len(self) == len(other) and list(self) == list(other)
+        except TypeError:
+            return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '%s(%d rows)' % (self.__class__.__name__, self._length)
+
+
+class TruthTable(BaseTruthTable):
+    """Truth table with bit-packed columns"""
+    __slots__ = ('_columns',)
+
+    def __init__(self, prefix=None, columns=None, length=0):
+        # Prefix lines (strobe signals) are equal for all rows and stored once
+        self._prefix = tuple(prefix or ())
+        # One packed array of shape (line width, bytes) per line
+        self._columns = tuple(columns or ())
+        self._length = length
+
+    @classmethod
+    def from_columns(cls, prefix, lines_columns, length):
+        """Create truth table from boolean arrays of shape (line width, rows) for each line"""
+        if not length:
+            return cls(prefix)
+        columns = list()
+        for line_columns in lines_columns:
+            line_columns = numpy.asarray(line_columns, dtype=numpy.bool_).reshape(-1, length)
+            columns.append(numpy.packbits(line_columns, axis=1))
+        return cls(prefix, columns, length)
+
+    @classmethod
+    def from_rows(cls, rows, prefix_length=0):
+        """Create truth table from list of tuples of lists"""
+        rows = list(rows)
+        if not rows:
+            return cls()
+        lines_columns = list()
+        for line_index in range(prefix_length, len(rows[0])):
+            lines_columns.append(numpy.array([row[line_index] for row in rows],
+                                             dtype=numpy.bool_).reshape(len(rows), len(rows[0][line_index])).T)
+        return cls.from_columns(rows[0][:prefix_length], lines_columns, len(rows))
+
+    @property
+    def nbytes(self):
+        return sum([column.nbytes for column in self._columns])
+
+    def _rows_slice(self, start, stop):
+        lines_columns = list()
+        offset = start % 8
+        for column in self._columns:
+            unpacked = numpy.unpackbits(column[:, start // 8:(stop + 7) // 8], axis=1)
+            lines_columns.append(unpacked[:, offset:offset + stop - start])
+        return join_lines(self._prefix, lines_columns, stop - start)
+
+
+class StreamingTruthTable(BaseTruthTable):
+    """Truth table which evaluates rows on demand, chunk by chunk"""
+    __slots__ = ('_lines_function',)
+
+    def __init__(self, prefix, lines_function, length):
+        self._prefix = tuple(prefix or ())
+        # Function of (start, stop) returning arrays of shape (line width, stop - start) for each line
+        self._lines_function = lines_function
+        self._length = length
+
+    def _rows_slice(self, start, stop):
+        return join_lines(self._prefix, self._lines_function(start, stop), stop - start)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+import unittest
+
+from circuitry.devices.adder import DeviceAdd, DeviceInc, DeviceDec
+from circuitry.devices.cmp import DeviceEq, DeviceCmp
+from circuitry.devices.mux import DeviceMux, DeviceDemux
+
+adder_architectures = ('ripple', 'kogge-stone', 'brent-kung', 'sklansky')
+
+
+class TestAdderArchitectures(unittest.TestCase):
+    def assertReference(self, device, vectors_count=None):
+        report = device.check_reference(vectors_count=vectors_count, seed=0)
+        self.assertEqual(report['mismatches'], 0, '%s %s %s' % (device.__class__.__name__,
+                                                                device._get_architecture(),
+                                                                report['counterexample']))
+
+    def test_adders(self):
+        for architecture in adder_architectures:
+            for first_width, second_width in ((1, 1), (4, 4), (5, 3)):
+                self.assertReference(DeviceAdd(strobe_signals='v:1',
+                                               first_signals='f:%s' % first_width,
+                                               second_signals='s:%s' % second_width,
+                                               output_signals='d:%s' % (max(first_width, second_width) + 2),
+                                               strobe_signals_subs=dict(v0=1),
+                                               architecture=architecture))
+
+    def test_wide_adders(self):
+        for architecture in adder_architectures[1:]:
+            for width in (13, 64):
+                self.assertReference(DeviceAdd(strobe_signals='v:1',
+                                               first_signals='f:%s' % width,
+                                               second_signals='s:%s' % width,
+                                               output_signals='d:%s' % (width + 2),
+                                               strobe_signals_subs=dict(v0=1),
+                                               architecture=architecture), vectors_count=1000)
+
+    def test_inc_dec(self):
+        for device_class in (DeviceInc, DeviceDec):
+            for architecture in adder_architectures:
+                self.assertReference(device_class(strobe_signals='v:1',
+                                                  data_signals='a:5',
+                                                  output_signals='d:7',
+                                                  strobe_signals_subs=dict(v0=1),
+                                                  architecture=architecture))
+
+
+class TestTreeArchitectures(unittest.TestCase):
+    def assertEquivalent(self, device, other_device):
+        report = device.check_equivalence(other_device)
+        self.assertTrue(report['equivalent'], '%s %s' % (device.__class__.__name__, report['counterexample']))
+
+    def test_mux_tree(self):
+        for address_count in (1, 2, 3, 4):
+            mux_kwargs = dict(strobe_signals='v:2',
+                              address_signals='a:%s' % address_count,
+                              data_signals='d:%s' % 2 ** address_count,
+                              output_signals='y:1',
+                              strobe_signals_subs=dict(v0=1, v1=0),
+                              output_signals_subs=dict(y0=1))
+            self.assertEquivalent(DeviceMux(architecture='tree', **mux_kwargs),
+                                  DeviceMux(architecture='sop', **mux_kwargs))
+
+    def test_demux_predecoder(self):
+        for address_count, outputs_count in ((1, 2), (2, 3), (3, 8), (4, 11)):
+            for data_value in (0, 1):
+                demux_kwargs = dict(strobe_signals='v:1',
+                                    address_signals='a:%s' % address_count,
+                                    data_signals='d:1',
+                                    output_signals='y:%s' % outputs_count,
+                                    strobe_signals_subs=dict(v0=1),
+                                    data_signals_subs=dict(d0=data_value),
+                                    output_signals_subs=dict([('y%s' % i, 1) for i in xrange(0, outputs_count)]))
+                self.assertEquivalent(DeviceDemux(architecture='predecoder', **demux_kwargs),
+                                      DeviceDemux(architecture='sop', **demux_kwargs))
+
+    def test_cmp_tree(self):
+        for width in (1, 2, 5, 8):
+            cmp_kwargs = dict(strobe_signals='v:1',
+                              first_signals='f:%s' % width,
+                              second_signals='s:%s' % width,
+                              strobe_signals_subs=dict(v0=1))
+            self.assertEquivalent(DeviceCmp(architecture='tree', output_signals='y:3', **cmp_kwargs),
+                                  DeviceCmp(architecture='chain', output_signals='y:3', **cmp_kwargs))
+            self.assertEquivalent(DeviceEq(architecture='tree', output_signals='y:1', **cmp_kwargs),
+                                  DeviceEq(architecture='chain', output_signals='y:1', **cmp_kwargs))
+
+
+if __name__ == '__main__':
+    unittest.main()
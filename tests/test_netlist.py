@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+import unittest
+
+from circuitry.devices.adder import DeviceAdd, Device21Comp, DeviceNeg
+from circuitry.devices.cmp import DeviceCmp
+from circuitry.devices.mux import DeviceMux
+from circuitry.exceptions import MaxFanInNotSupported
+from circuitry.logic.equivalence import check_equivalence
+from circuitry.logic.mapping import map_fan_in
+from circuitry.logic.optimization import optimize_netlist
+
+
+def get_netlists():
+    """Netlists of devices as they are built, without optimization"""
+    devices_kwargs = [
+        (DeviceAdd, dict(strobe_signals='v:1', first_signals='f:4', second_signals='s:4', output_signals='d:6',
+                         strobe_signals_subs=dict(v0=1))),
+        (DeviceAdd, dict(strobe_signals='v:1', first_signals='f:8', second_signals='s:8', output_signals='d:10',
+                         strobe_signals_subs=dict(v0=1), architecture='sklansky')),
+        (Device21Comp, dict(strobe_signals='v:1', data_signals='a:5', output_signals='d:5',
+                            strobe_signals_subs=dict(v0=1))),
+        (DeviceNeg, dict(strobe_signals='v:1', data_signals='a:4', output_signals='d:4',
+                         strobe_signals_subs=dict(v0=1))),
+        (DeviceCmp, dict(strobe_signals='v:1', first_signals='f:4', second_signals='s:4', output_signals='y:3',
+                         strobe_signals_subs=dict(v0=1))),
+        (DeviceMux, dict(strobe_signals='v:2', address_signals='a:3', data_signals='d:8', output_signals='y:1',
+                         strobe_signals_subs=dict(v0=1, v1=0), output_signals_subs=dict(y0=1))),
+    ]
+    return [device_class(optimization_passes=(), **device_kwargs).netlist
+            for device_class, device_kwargs in devices_kwargs]
+
+
+class TestNetlistTransformations(unittest.TestCase):
+    def assertEquivalent(self, netlist, other_netlist):
+        for engine in ('sat', 'bdd'):
+            report = check_equivalence(netlist, other_netlist, engine)
+            self.assertTrue(report['equivalent'], '%s %s' % (engine, report['counterexample']))
+
+    def test_optimize_netlist(self):
+        for netlist in get_netlists():
+            optimized_netlist, report = optimize_netlist(netlist)
+            self.assertEqual(report['gates_after'], optimized_netlist.count_gates())
+            self.assertTrue(report['gates_after'] <= report['gates_before'])
+            self.assertEquivalent(netlist, optimized_netlist)
+
+    def test_map_fan_in(self):
+        for netlist in get_netlists():
+            for max_fan_in in (2, 3):
+                mapped_netlist, _ = map_fan_in(netlist, {'and': max_fan_in, 'or': max_fan_in, 'xor': max_fan_in})
+                self.assertTrue(all([len(mapped_netlist.operands[node]) <= max_fan_in
+                                     for node in mapped_netlist.reachable_nodes()]))
+                self.assertEquivalent(netlist, mapped_netlist)
+
+    def test_map_fan_in_less_than_2(self):
+        netlist = get_netlists()[0]
+        for max_fan_in in (0, 1):
+            self.assertRaises(MaxFanInNotSupported, map_fan_in, netlist, {'or': max_fan_in})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Sergey Sobko'
+__email__ = 'S.Sobko@profitware.ru'
+__copyright__ = 'Copyright 2014, The Profitware Group'
+
+import unittest
+
+from circuitry.devices import Device
+from circuitry.devices.adder import DeviceAdd, DeviceInc, DeviceDec, Device12Comp, Device21Comp, DeviceNeg
+from circuitry.devices.cmp import DeviceEq, DeviceCmp
+from circuitry.devices.mux import DeviceMux, DeviceMuxStrict, DeviceDemux
+from circuitry.devices.simple import DeviceAnd, DeviceNot
+
+
+def get_devices_kwargs():
+    """Small devices of each class with keyword arguments they are created with"""
+    return [
+        (DeviceAdd, dict(strobe_signals='v:1', first_signals='f:3', second_signals='s:2', output_signals='d:5',
+                         strobe_signals_subs=dict(v0=1))),
+        (DeviceAdd, dict(strobe_signals='v:1', first_signals='f:3', second_signals='s:3', output_signals='d:5',
+                         strobe_signals_subs=dict(v0=1), architecture='kogge-stone')),
+        (DeviceInc, dict(strobe_signals='v:1', data_signals='a:3', output_signals='d:4',
+                         strobe_signals_subs=dict(v0=1))),
+        (DeviceDec, dict(strobe_signals='v:1', data_signals='a:3', output_signals='d:4',
+                         strobe_signals_subs=dict(v0=1))),
+        (Device12Comp, dict(strobe_signals='v:1', data_signals='a:3', output_signals='d:3',
+                            strobe_signals_subs=dict(v0=1))),
+        (Device21Comp, dict(strobe_signals='v:1', data_signals='a:3', output_signals='d:3',
+                            strobe_signals_subs=dict(v0=1))),
+        (DeviceNeg, dict(strobe_signals='v:2', data_signals='a:3', output_signals='d:3',
+                         strobe_signals_subs=dict(v0=1, v1=0))),
+        (DeviceEq, dict(strobe_signals='v:1', first_signals='f:3', second_signals='s:3', output_signals='y:1',
+                        strobe_signals_subs=dict(v0=1))),
+        (DeviceCmp, dict(strobe_signals='v:1', first_signals='f:3', second_signals='s:3', output_signals='y:3',
+                         strobe_signals_subs=dict(v0=1), architecture='tree')),
+        (DeviceAnd, dict(data_signals='x:3', output_signals='y:1', output_signals_subs=dict(y0=1))),
+        (DeviceNot, dict(data_signals='x:2', output_signals='y:2')),
+        (DeviceMux, dict(strobe_signals='v:2', address_signals='a:2', data_signals='d:4', output_signals='y:1',
+                         strobe_signals_subs=dict(v0=1, v1=0), output_signals_subs=dict(y0=1))),
+        (DeviceMuxStrict, dict(strobe_signals='v:1', address_signals='a:2', data_signals='d:3', output_signals='y:1',
+                               strobe_signals_subs=dict(v0=1), output_signals_subs=dict(y0=0))),
+        (DeviceDemux, dict(strobe_signals='v:1', address_signals='a:2', data_signals='d:1', output_signals='y:3',
+                           strobe_signals_subs=dict(v0=1), data_signals_subs=dict(d0=1),
+                           output_signals_subs=dict(y0=1, y1=1, y2=1))),
+    ]
+
+
+def get_rows(truth_table):
+    return [[list(line) for line in row] for row in truth_table]
+
+
+class TestEvaluationBackends(unittest.TestCase):
+    def test_backends_equal_sympy(self):
+        for device_class, device_kwargs in get_devices_kwargs():
+            sympy_rows = get_rows(device_class(evaluation_backend='sympy', **device_kwargs).truth_table)
+            for evaluation_backend in Device.evaluation_backends:
+                rows = get_rows(device_class(evaluation_backend=evaluation_backend, **device_kwargs).truth_table)
+                self.assertEqual(rows, sympy_rows, '%s %s' % (device_class.__name__, evaluation_backend))
+
+    def test_streaming_and_workers_equal_sympy(self):
+        for device_class, device_kwargs in get_devices_kwargs():
+            sympy_rows = get_rows(device_class(evaluation_backend='sympy', **device_kwargs).truth_table)
+            self.assertEqual(get_rows(device_class(streaming=True, **device_kwargs).truth_table), sympy_rows,
+                             device_class.__name__)
+            self.assertEqual(get_rows(device_class(workers=2, **device_kwargs).truth_table), sympy_rows,
+                             device_class.__name__)
+
+
+if __name__ == '__main__':
+    unittest.main()